@@ -1,19 +1,39 @@
 """go-eCharger integration"""
 
+import asyncio
 import voluptuous as vol
 import ipaddress
 import logging
 from datetime import timedelta
 import homeassistant.helpers.config_validation as cv
-from homeassistant.const import CONF_HOST, CONF_SCAN_INTERVAL
+from homeassistant.const import CONF_HOST, CONF_SCAN_INTERVAL, EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import valid_entity_id
+try:
+    from homeassistant.core import SupportsResponse
+except ImportError:
+    # Service responses are only available since Home Assistant 2023.7
+    SupportsResponse = None
 from homeassistant import core
 from homeassistant.helpers.discovery import async_load_platform
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import DOMAIN, CONF_SERIAL, CONF_CHARGERS, CONF_CORRECTION_FACTOR, CONF_NAME, CONF_API_LEVEL, CHARGER_API
-from .charger import Charger
+try:
+    from homeassistant.exceptions import ServiceValidationError
+except ImportError:
+    # Only available since Home Assistant 2023.11
+    from homeassistant.exceptions import HomeAssistantError as ServiceValidationError
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DOMAIN, CONF_SERIAL, CONF_CHARGERS, CONF_CORRECTION_FACTOR, CONF_NAME, CONF_API_LEVEL, CHARGER_API,
+    ATTRIBUTE_TIERS, STATUS_TIERS, TIER_STATIC, TIER_CONFIG, TIER_LIVE, CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW,
+    CONF_HEDGE_STATUS_READS, DEFAULT_HEDGE_STATUS_READS, CONF_PUSH_TOPIC, DEFAULT_PUSH_TOPIC,
+)
+from .charger import Charger, ChargerConnectionError, ChargerUnavailableError, InvalidAPILevelError
+from .protocol import load_backend
+from .push import PushSubscription, PUSH_RECONCILE_INTERVAL
+from .snapshot import StatusSnapshot
+from .store import StatusStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,9 +44,20 @@ CHARGE_LIMIT = "charge_limit"
 SET_MAX_CURRENT_ATTR = "max_current"
 CHARGER_NAME_ATTR = "charger_name"
 SET_PHASE_MODE_ATTR = "phase_mode"
+SET_CHARGING_MODE_ATTR = "charging_mode"
 
 MIN_UPDATE_INTERVAL = timedelta(seconds=10)
 DEFAULT_UPDATE_INTERVAL = timedelta(seconds=20)
+# Upper bound for a single charger's status request, so one offline device can't stall the whole poll cycle
+FETCH_TIMEOUT = timedelta(seconds=8)
+# While idle the poll interval is multiplied by IDLE_BACKOFF_FACTOR on every unchanged poll, up to MAX_IDLE_UPDATE_INTERVAL
+MAX_IDLE_UPDATE_INTERVAL = timedelta(minutes=5)
+IDLE_BACKOFF_FACTOR = 2
+CAR_STATUS_CHARGING = "charging"
+# Configuration values are re-read at least this often, even without a service call
+CONFIG_UPDATE_INTERVAL = timedelta(minutes=10)
+# Chargers set up within this delay get their first refresh in one concurrent batch
+STARTUP_BATCH_DELAY = timedelta(seconds=1)
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -40,6 +71,10 @@ CONFIG_SCHEMA = vol.Schema(
                             vol.Optional(
                                 CONF_CORRECTION_FACTOR, default="1.0"
                             ): vol.All(cv.string),
+                            vol.Optional(CONF_API_LEVEL, default="1"): vol.All(cv.string, vol.In(["1", "2"])),
+                            vol.Optional(CONF_SCAN_INTERVAL): vol.All(
+                                cv.time_period, vol.Clamp(min=MIN_UPDATE_INTERVAL)
+                            ),
                         })
                     ]
                 ]),
@@ -58,25 +93,161 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
+def _get_scan_interval(config):
+    """Return the scan interval configured for a config entry (options take precedence over data)."""
+    scan_interval = config.options.get(CONF_SCAN_INTERVAL, config.data.get(CONF_SCAN_INTERVAL))
+    if scan_interval is None:
+        return DEFAULT_UPDATE_INTERVAL
+    return max(timedelta(seconds=int(scan_interval)), MIN_UPDATE_INTERVAL)
+
+
+async def _async_load_backends(hass, apiLevels):
+    """Import the protocol backends of the given API levels in the executor, so the import doesn't block the loop."""
+    for apiLevel in {str(apiLevel) for apiLevel in apiLevels}:
+        await hass.async_add_executor_job(load_backend, apiLevel)
+
+
+def _acquire_charger(hass, host, api_level, commandWindow=DEFAULT_COMMAND_WINDOW,
+                     hedgeStatusReads=DEFAULT_HEDGE_STATUS_READS):
+    """Return the shared Charger of a device, so that all platforms and services use the same connection.
+
+    If the charger is already in use (e.g. set up in YAML and as config entry), the given options replace its options.
+    """
+    clients = hass.data[DOMAIN]["clients"]
+    key = (host, str(api_level))
+    if key not in clients:
+        clients[key] = [Charger(host, api_level, commandWindow, hedgeStatusReads=hedgeStatusReads), 0]
+    else:
+        goeCharger = clients[key][0]
+        options = {"commandWindow": commandWindow, "hedgeStatusReads": hedgeStatusReads}
+        if goeCharger.get_options() != options:
+            _LOGGER.warning(f"Charger {host} is already in use with other options, changing them to {options}")
+            goeCharger.set_options(**options)
+    clients[key][1] += 1
+    return clients[key][0]
+
+
+async def _async_release_charger(hass, goeCharger):
+    """Release a Charger from _acquire_charger, the connection is closed when nobody uses it anymore."""
+    clients = hass.data[DOMAIN]["clients"]
+    key = (goeCharger.host, goeCharger.api_level)
+    if key not in clients:
+        return
+    clients[key][1] -= 1
+    if clients[key][1] <= 0:
+        del clients[key]
+        await goeCharger.async_close()
+
+
+def _create_background_task(hass, target, name):
+    """Run target without holding up the Home Assistant startup (background tasks are only available since 2023.2)."""
+    if hasattr(hass, "async_create_background_task"):
+        return hass.async_create_background_task(target, name)
+    return hass.async_create_task(target)
+
+
+def _create_coordinator(hass, chargerName, goeCharger, scan_interval):
+    """Create and register the coordinator polling a single charger, starting with its last known status."""
+    chargeStateFetcher = ChargerStateFetcher(hass, chargerName, goeCharger)
+
+    coordinator = DataUpdateCoordinator(
+        hass,
+        _LOGGER,
+        name=f"{DOMAIN}_{chargerName}",
+        update_method=chargeStateFetcher.fetch_states,
+        update_interval=scan_interval,
+    )
+    chargeStateFetcher.coordinator = coordinator
+    lastStatus = hass.data[DOMAIN]["store"].get_status(chargerName)
+    if lastStatus:
+        chargeStateFetcher.restore(lastStatus)
+
+    hass.data[DOMAIN]["api"][chargerName] = goeCharger
+    hass.data[DOMAIN]["coordinators"][chargerName] = coordinator
+    hass.data[DOMAIN]["fetchers"][chargerName] = chargeStateFetcher
+    return coordinator
+
+
+async def _async_send_command(hass, chargerName, command, *args, **kwargs):
+    """Send a command (name of a Charger setter) to a charger and update its status with the written value."""
+    goeCharger = hass.data[DOMAIN]["api"][chargerName]
+    return await hass.data[DOMAIN]["fetchers"][chargerName].async_command(getattr(goeCharger, command), *args, **kwargs)
+
+
+async def _async_send_commands(hass, chargerNameInput, command, *args, **kwargs):
+    """Send a command to the named charger or, if no name is given, to all chargers concurrently.
+
+    Returns the result per charger, so service calls can report which chargers failed. An unknown charger name is
+    an invalid service call.
+    """
+    if len(chargerNameInput) > 0 and chargerNameInput not in hass.data[DOMAIN]["api"]:
+        raise ServiceValidationError(f"Charger with name '{chargerNameInput}' not found")
+    chargerNames = [chargerNameInput] if len(chargerNameInput) > 0 else list(hass.data[DOMAIN]["api"].keys())
+
+    async def async_send(chargerName):
+        if chargerName not in hass.data[DOMAIN]["api"]:
+            _LOGGER.error(f"Charger with name '{chargerName}' not found!")
+            return {"success": False, "error": "not found"}
+        try:
+            await _async_send_command(hass, chargerName, command, *args, **kwargs)
+        except (ChargerConnectionError, InvalidAPILevelError) as err:
+            _LOGGER.error(f"Unable to {command} for charger '{chargerName}': {err}")
+            return {"success": False, "error": str(err)}
+        return {"success": True}
+
+    results = await asyncio.gather(*[async_send(chargerName) for chargerName in chargerNames])
+    return {"chargers": dict(zip(chargerNames, results))}
+
+
+def _schedule_first_refresh(hass, chargerName):
+    """Queue the first refresh of a charger, all chargers set up at about the same time are refreshed together."""
+    pending = hass.data[DOMAIN]["pendingRefresh"]
+    pending.add(chargerName)
+    if len(pending) == 1:
+        _create_background_task(hass, _async_refresh_pending(hass), f"{DOMAIN} first refresh")
+
+
+async def _async_refresh_pending(hass):
+    await asyncio.sleep(STARTUP_BATCH_DELAY.total_seconds())
+    pending = hass.data[DOMAIN]["pendingRefresh"]
+    chargerNames = list(pending)
+    pending.clear()
+    _LOGGER.debug(f"first refresh of {chargerNames}")
+    coordinators = hass.data[DOMAIN]["coordinators"]
+    await asyncio.gather(
+        *[coordinators[chargerName].async_refresh() for chargerName in chargerNames if chargerName in coordinators]
+    )
+
+
 async def async_setup_entry(hass, config):
     _LOGGER.debug("async_Setup_entry")
     _LOGGER.debug(repr(config.data))
 
     name = config.data[CONF_NAME]
-    # charger = GoeChargerV1(config.data[CONF_HOST])
-    goeCharger = Charger(config.data[CONF_HOST], config.data[CONF_API_LEVEL])
-    hass.data[DOMAIN]["api"][name] = goeCharger
+    await _async_load_backends(hass, [config.data[CONF_API_LEVEL]])
+    goeCharger = _acquire_charger(
+        hass,
+        config.data[CONF_HOST],
+        config.data[CONF_API_LEVEL],
+        config.options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW),
+        config.options.get(CONF_HEDGE_STATUS_READS, DEFAULT_HEDGE_STATUS_READS),
+    )
+    coordinator = _create_coordinator(hass, name, goeCharger, _get_scan_interval(config))
 
-    await hass.data[DOMAIN]["coordinator"].async_refresh()
-    # Find proper way to handle this and decide if this is even needed
-    # try:
-    #     await hass.data[DOMAIN]["coordinator"].async_refresh()
-    # except: 
-    #     raise ConfigEntryNotReady(f"Timeout while connecting to {config.data[CONF_HOST]}")
+    # The entities start with the last known status, the charger doesn't have to be online for the setup
+    _schedule_first_refresh(hass, name)
 
+    pushTopic = config.options.get(CONF_PUSH_TOPIC, DEFAULT_PUSH_TOPIC)
+    if pushTopic and str(config.data[CONF_API_LEVEL]) == "2":
+        # Pushed updates keep the status current, polling only reconciles it while they arrive
+        fetcher = hass.data[DOMAIN]["fetchers"][name]
+        fetcher.push = PushSubscription(hass, name, goeCharger, fetcher, pushTopic)
+        config.async_on_unload(fetcher.push.stop)
+        _create_background_task(hass, fetcher.push.async_start(), f"{DOMAIN} push {name}")
+    elif pushTopic:
+        _LOGGER.warning(f"Charger '{name}' uses API v1, which doesn't push its status, ignoring the push topic")
 
-    # await hass.data[DOMAIN]["coordinator"].async_config_entry_first_refresh()
-    # TODO: Maybe return an ConfigEntryNotReady Exception when the charger isn't online => Setup failed (https://developers.home-assistant.io/docs/integration_setup_failures)
+    config.async_on_unload(config.add_update_listener(async_reload_entry))
 
     hass.async_create_task(
         hass.config_entries.async_forward_entry_setup(config, "sensor")
@@ -87,10 +258,20 @@ async def async_setup_entry(hass, config):
     return True
 
 
+async def async_reload_entry(hass, entry):
+    """Reload the charger when its options (e.g. the scan interval) changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass, entry):
     _LOGGER.debug(f"Unloading charger '{entry.data[CONF_NAME]}")
-    hass.data[DOMAIN]["api"].pop(entry.data[CONF_NAME])
-    return True
+    unloaded = await hass.config_entries.async_unload_platforms(entry, ["sensor", "switch"])
+    if unloaded:
+        hass.data[DOMAIN]["coordinators"].pop(entry.data[CONF_NAME], None)
+        hass.data[DOMAIN]["fetchers"].pop(entry.data[CONF_NAME], None)
+        goeCharger = hass.data[DOMAIN]["api"].pop(entry.data[CONF_NAME])
+        await _async_release_charger(hass, goeCharger)
+    return unloaded
 
 
 async def async_migrate_entry(hass, config_entry):
@@ -110,23 +291,206 @@ async def async_migrate_entry(hass, config_entry):
     return True
 
 
+async def _async_setup_discovered_charger(hass, config, charger):
+    """Read the serial of a charger configured by host only and set it up with the serial as its name."""
+    host = charger[0][CONF_HOST]
+    goeCharger = _acquire_charger(hass, host, charger[0][CONF_API_LEVEL])
+    while True:
+        try:
+            status = await goeCharger.request_status()
+            break
+        except ChargerConnectionError as err:
+            _LOGGER.warning(f"Unable to read the serial of the charger at {host}, retrying: {err}")
+        # Retry with the backoff of the charger's circuit breaker
+        await asyncio.sleep(max(goeCharger.health.retry_in, DEFAULT_UPDATE_INTERVAL.total_seconds()))
+
+    serial = status["serial_number"]
+    hass.data[DOMAIN]["store"].set_serial(host, serial)
+    charger[0][CONF_NAME] = serial
+    _LOGGER.debug(f"discovered charger '{serial}' at '{host}'")
+
+    coordinator = _create_coordinator(hass, serial, goeCharger, charger[0][CONF_SCAN_INTERVAL])
+    await coordinator.async_refresh()
+    for platform in ("sensor", "switch"):
+        hass.async_create_task(async_load_platform(
+            hass, platform, DOMAIN, {CONF_CHARGERS: [charger], CHARGER_API: hass.data[DOMAIN]["api"]}, config)
+        )
+
+
 class ChargerStateFetcher:
-    def __init__(self, hass):
+    def __init__(self, hass, chargerName, goeCharger):
         self._hass = hass
+        self._chargerName = chargerName
+        self._goeCharger = goeCharger
+        self._fastUpdateInterval = None
+        self._lastCarStatus = None
+        # The status is refreshed in tiers at different rates, this is the time of the last refresh of each tier. The
+        # status itself is only kept as the StatusSnapshot in coordinator.data.
+        self.tierUpdated = {tier: None for tier in STATUS_TIERS}
+        self._reconnected = True
+        self._configInvalidated = True
+        # Attributes that changed with the last update, entities of unchanged attributes don't write their state
+        self.changedAttributes = set()
+        # Version of the last StatusSnapshot published to the coordinator
+        self._version = 0
+        # PushSubscription of a charger publishing its status via MQTT
+        self.push = None
+
+    def restore(self, status):
+        """Start with a stored status, all tiers are re-read on the first refresh."""
+        self.coordinator.data = self._create_snapshot(status)
+
+    def _create_snapshot(self, attributes, drop=()):
+        """Create the next snapshot of the status from the current one, with the attributes changed."""
+        self._version += 1
+        if self.coordinator.data is None:
+            return StatusSnapshot.from_dict(attributes, self._version)
+        return self.coordinator.data.update(attributes, self._version, drop)
+
+    def apply_status(self, attributes, pushed=False):
+        """Merge the given attributes into the current status and notify the entities of the changed ones.
+
+        A pushed status doesn't reschedule the next poll, otherwise frequent pushes would postpone it forever.
+        """
+        if self.coordinator.data is None:
+            return
+        status = self._create_snapshot(attributes)
+        self.changedAttributes = status.diff(self.coordinator.data)
+        if not self.changedAttributes:
+            return
+        if pushed:
+            self.coordinator.data = status
+            self.coordinator.async_update_listeners()
+        else:
+            self.coordinator.async_set_updated_data(status)
+        # While the status is pushed, the reconciliation poll is too rare to keep the stored status current
+        self._hass.data[DOMAIN]["store"].update_status(self._chargerName, status)
+
+    def push_started(self):
+        """Slow polling down to the reconciliation interval once the status is pushed."""
+        if self.coordinator.data is not None:
+            self._adapt_update_interval(self.coordinator.data)
+
+    def push_stopped(self):
+        """Poll at the normal interval again when no status was pushed for a while."""
+        if self._fastUpdateInterval is not None:
+            self.coordinator.update_interval = self._fastUpdateInterval
+        self._hass.async_create_task(self.coordinator.async_request_refresh())
+
+    async def async_command(self, setter, *args, **kwargs):
+        """Send a command to the charger.
+
+        The written value is applied to the status right away and replaced by the value the charger confirmed, so no
+        full refresh is needed.
+        """
+        if self._fastUpdateInterval is not None:
+            self.coordinator.update_interval = self._fastUpdateInterval
+        try:
+            confirmed = await setter(*args, optimistic=self.apply_status, **kwargs)
+        except Exception:
+            # Drop the optimistic value with a full refresh
+            self._configInvalidated = True
+            await self.coordinator.async_request_refresh()
+            raise
+        if confirmed:
+            self.apply_status(confirmed)
+        return confirmed
+
+    def _get_due_tiers(self, now):
+        """Return the tiers that have to be refreshed in this cycle."""
+        tiers = {TIER_LIVE}
+        if self._reconnected or self.tierUpdated[TIER_STATIC] is None:
+            tiers.add(TIER_STATIC)
+        if (
+            self._configInvalidated
+            or self.tierUpdated[TIER_CONFIG] is None
+            or now - self.tierUpdated[TIER_CONFIG] >= CONFIG_UPDATE_INTERVAL
+        ):
+            tiers.add(TIER_CONFIG)
+        return frozenset(tiers)
+
+    def _adapt_update_interval(self, status):
+        """Poll fast while charging or after a change of the car status, back off step by step while idle."""
+        if self._fastUpdateInterval is None:
+            self._fastUpdateInterval = self.coordinator.update_interval
+
+        carStatus = status.get("car_status")
+        if self.push is not None and self.push.active:
+            # The status is pushed, polling only reconciles it
+            updateInterval = max(PUSH_RECONCILE_INTERVAL, self._fastUpdateInterval)
+        elif carStatus != self._lastCarStatus or str(carStatus).lower() == CAR_STATUS_CHARGING:
+            updateInterval = self._fastUpdateInterval
+        else:
+            updateInterval = min(
+                self.coordinator.update_interval * IDLE_BACKOFF_FACTOR,
+                max(MAX_IDLE_UPDATE_INTERVAL, self._fastUpdateInterval),
+            )
+        self._lastCarStatus = carStatus
+
+        if updateInterval != self.coordinator.update_interval:
+            _LOGGER.debug(f"poll interval for '{self._chargerName}' is now {updateInterval}")
+            self.coordinator.update_interval = updateInterval
 
     async def fetch_states(self):
-        _LOGGER.debug(f'Updating status... - API Level: {self._hass.data}')
-        goeChargers = self._hass.data[DOMAIN]["api"]
-        data = self.coordinator.data if self.coordinator.data else {}
-        for chargerName in goeChargers.keys():
-            _LOGGER.debug(f"update for '{chargerName}'..")
-            # TODO: Check this call
-            fetchedStatus = await self._hass.async_add_executor_job(goeChargers[chargerName].request_status)
-            if fetchedStatus.get("car_status", "unknown") != "unknown":
-                data[chargerName] = fetchedStatus
-            else:
-                _LOGGER.error(f"Unable to fetch state for Charger {chargerName}")
-        return data
+        _LOGGER.debug(f"update for '{self._chargerName}'..")
+        data = self.coordinator.data
+        now = dt_util.utcnow()
+        tiers = self._get_due_tiers(now)
+        health = self._goeCharger.health
+        try:
+            # Every charger has its own coordinator, so a slow charger only delays its own update (bounded by FETCH_TIMEOUT)
+            fetchedStatus = await asyncio.wait_for(self._goeCharger.request_status(tiers), FETCH_TIMEOUT.total_seconds())
+        except ChargerUnavailableError as err:
+            _LOGGER.debug(str(err))
+            self._charger_down()
+            raise UpdateFailed(str(err)) from err
+        except (asyncio.TimeoutError, ChargerConnectionError) as err:
+            self._reconnected = True
+            self.changedAttributes = set()
+            if not health.available:
+                # The entities become unavailable instead of showing stale values
+                self._charger_down()
+                raise UpdateFailed(f"Charger {self._chargerName} is unreachable") from err
+            _LOGGER.warning(f"Unable to fetch state for Charger {self._chargerName}: {str(err) or 'timeout'}")
+            return data
+
+        if not fetchedStatus:
+            _LOGGER.error(f"Unable to fetch state for Charger {self._chargerName}")
+            self.changedAttributes = set()
+            return data
+
+        if not self.coordinator.last_update_success:
+            # Back from a backoff, _adapt_update_interval switches to the fast poll interval on the unknown car status
+            self._lastCarStatus = None
+
+        for tier in tiers:
+            self.tierUpdated[tier] = now
+        # The tiers only decide which keys are requested, every value in the response is current (the v1 status
+        # always contains everything). Attributes of the refreshed tiers missing in the response are dropped.
+        current = self.coordinator.data
+        drop = [
+            attribute for attribute in (current or ())
+            if attribute not in fetchedStatus and ATTRIBUTE_TIERS.get(attribute, TIER_LIVE) in tiers
+        ]
+        self._reconnected = False
+        self._configInvalidated = False
+
+        self._adapt_update_interval(fetchedStatus)
+        status = self._create_snapshot(fetchedStatus, drop)
+        self.changedAttributes = status.diff(current)
+        if self.changedAttributes:
+            self._hass.data[DOMAIN]["store"].update_status(self._chargerName, status)
+        return status
+
+    def _charger_down(self):
+        """Poll a charger that is down only when its circuit breaker allows the next probe."""
+        self._reconnected = True
+        self.changedAttributes = set()
+        if self._fastUpdateInterval is None:
+            self._fastUpdateInterval = self.coordinator.update_interval
+        self.coordinator.update_interval = max(
+            self._fastUpdateInterval, timedelta(seconds=self._goeCharger.health.retry_in)
+        )
 
 
 async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
@@ -135,8 +499,9 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
     _LOGGER.debug("async_setup")
     scan_interval = DEFAULT_UPDATE_INTERVAL
 
-    hass.data[DOMAIN] = {}
-    chargerApi = {}
+    hass.data[DOMAIN] = {"api": {}, "coordinators": {}, "fetchers": {}, "clients": {}, "store": StatusStore(hass),
+                       "pendingRefresh": set()}
+    await hass.data[DOMAIN]["store"].async_load()
     chargers = []
     # TODO: Find fix for this
     api_level = -1
@@ -154,42 +519,39 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
             correctionFactor = 1.0
 
         chargers = config[DOMAIN].get(CONF_CHARGERS, [])
+        await _async_load_backends(
+            hass, [api_level] * bool(host) + [charger[0].get(CONF_API_LEVEL, "1") for charger in chargers]
+        )
 
         if host:
             if not serial:
-                goeCharger = Charger(host, api_level)
-                status = goeCharger.request_status()
-                serial = status["serial_number"]
-            chargers.append([{CONF_NAME: serial, CONF_HOST: host, CONF_CORRECTION_FACTOR: correctionFactor,
-                              CONF_API_LEVEL: api_level}])
+                serial = hass.data[DOMAIN]["store"].get_serial(host)
+            charger = [{CONF_NAME: serial, CONF_HOST: host, CONF_CORRECTION_FACTOR: correctionFactor,
+                        CONF_API_LEVEL: api_level, CONF_SCAN_INTERVAL: scan_interval}]
+            if serial:
+                chargers.append(charger)
+            else:
+                # The serial is the name of the charger, its entities are added once it is known
+                _create_background_task(
+                    hass, _async_setup_discovered_charger(hass, config, charger), f"{DOMAIN} discovery of {host}"
+                )
         _LOGGER.debug(repr(chargers))
 
         for charger in chargers:
             chargerName = charger[0][CONF_NAME]
             host = charger[0][CONF_HOST]
-            # TODO: Check this
-            api_level = charger[0][CONF_API_LEVEL]
+            api_level = charger[0].get(CONF_API_LEVEL, "1")
             _LOGGER.debug(f"charger: '{chargerName}' host: '{host}' ")
 
-            goeCharger = Charger(host, api_level)
-            chargerApi[chargerName] = goeCharger
+            goeCharger = _acquire_charger(hass, host, api_level)
+            _create_coordinator(hass, chargerName, goeCharger, charger[0].get(CONF_SCAN_INTERVAL, scan_interval))
+            _schedule_first_refresh(hass, chargerName)
 
-    hass.data[DOMAIN]["api"] = chargerApi
+    async def async_close_sessions(event):
+        """Close the HTTP sessions of all chargers."""
+        await asyncio.gather(*[client[0].async_close() for client in hass.data[DOMAIN]["clients"].values()])
 
-    chargeStateFecher = ChargerStateFetcher(hass)
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=chargeStateFecher.fetch_states,
-        update_interval=scan_interval,
-    )
-    chargeStateFecher.coordinator = coordinator
-
-    hass.data[DOMAIN]["coordinator"] = coordinator
-
-    await coordinator.async_refresh()
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_sessions)
 
     async def async_handle_set_max_current(call):
         """Handle the service call to set the absolute max current."""
@@ -205,10 +567,7 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
             elif valid_entity_id(maxCurrentInput):
                 maxCurrent = int(hass.states.get(maxCurrentInput).state)
             else:
-                _LOGGER.error(
-                    "No valid value for '%s': %s", SET_MAX_CURRENT_ATTR, maxCurrent
-                )
-                return
+                raise ServiceValidationError(f"No valid value for '{SET_MAX_CURRENT_ATTR}': {maxCurrentInput}")
         else:
             maxCurrent = maxCurrentInput
 
@@ -218,24 +577,8 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
         if maxCurrent > 32:
             maxCurrent = 32
 
-        if len(chargerNameInput) > 0:
-            _LOGGER.debug(f"set max_current for charger '{chargerNameInput}' to {maxCurrent}")
-            try:
-                # TODO: Check
-                await hass.async_add_executor_job(hass.data[DOMAIN]["api"][chargerNameInput].set_tmp_max_current, maxCurrent)
-            except KeyError:
-                _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        else:
-            for charger in hass.data[DOMAIN]["api"].keys():
-                try:
-                    _LOGGER.debug(f"set max_current for charger '{charger}' to {maxCurrent}")
-                    # TODO: Check
-                    await hass.async_add_executor_job(hass.data[DOMAIN]["api"][charger].set_tmp_max_current, maxCurrent)
-                except KeyError:
-                    _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        await hass.data[DOMAIN]["coordinator"].async_refresh()
+        _LOGGER.debug(f"set max_current for charger(s) '{chargerNameInput}' to {maxCurrent}")
+        return await _async_send_commands(hass, chargerNameInput, "set_tmp_max_current", maxCurrent)
 
     async def async_handle_set_absolute_max_current(call):
         """Handle the service call to set the absolute max current."""
@@ -247,12 +590,9 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
             elif valid_entity_id(absoluteMaxCurrentInput):
                 absoluteMaxCurrent = int(hass.states.get(absoluteMaxCurrentInput).state)
             else:
-                _LOGGER.error(
-                    "No valid value for '%s': %s",
-                    SET_ABSOLUTE_MAX_CURRENT_ATTR,
-                    absoluteMaxCurrentInput,
+                raise ServiceValidationError(
+                    f"No valid value for '{SET_ABSOLUTE_MAX_CURRENT_ATTR}': {absoluteMaxCurrentInput}"
                 )
-                return
         else:
             absoluteMaxCurrent = absoluteMaxCurrentInput
 
@@ -261,28 +601,8 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
         if absoluteMaxCurrent > 32:
             absoluteMaxCurrent = 32
 
-        if len(chargerNameInput) > 0:
-            _LOGGER.debug(f"set absolute_max_current for charger '{chargerNameInput}' to {absoluteMaxCurrent}")
-            try:
-                await hass.async_add_executor_job(
-                    # TODO: Check
-                    hass.data[DOMAIN]["api"][chargerNameInput].set_absolute_max_current, absoluteMaxCurrent
-                )
-            except KeyError:
-                _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        else:
-            for charger in hass.data[DOMAIN]["api"].keys():
-                try:
-                    _LOGGER.debug(f"set absolute_max_current for charger '{charger}' to {absoluteMaxCurrent}")
-                    await hass.async_add_executor_job(
-                        # TODO: Check
-                        hass.data[DOMAIN]["api"][charger].set_absolute_max_current, absoluteMaxCurrent
-                    )
-                except KeyError:
-                    _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        await hass.data[DOMAIN]["coordinator"].async_refresh()
+        _LOGGER.debug(f"set absolute_max_current for charger(s) '{chargerNameInput}' to {absoluteMaxCurrent}")
+        return await _async_send_commands(hass, chargerNameInput, "set_absolute_max_current", absoluteMaxCurrent)
 
     async def async_handle_set_cable_lock_mode(call):
         """Handle the service call to set the cable lock mode."""
@@ -294,12 +614,9 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
             elif valid_entity_id(cableLockModeInput):
                 cableLockMode = int(hass.states.get(cableLockModeInput).state)
             else:
-                _LOGGER.error(
-                    "No valid value for '%s': %s",
-                    SET_CABLE_LOCK_MODE_ATTR,
-                    cableLockModeInput,
+                raise ServiceValidationError(
+                    f"No valid value for '{SET_CABLE_LOCK_MODE_ATTR}': {cableLockModeInput}"
                 )
-                return
         else:
             cableLockMode = cableLockModeInput
 
@@ -309,28 +626,8 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
         if cableLockMode >= 2:
             cableLockModeEnum = Charger.CableLockMode.LOCKED
 
-        if len(chargerNameInput) > 0:
-            _LOGGER.debug(f"set set_cable_lock_mode for charger '{chargerNameInput}' to {cableLockModeEnum}")
-            try:
-                await hass.async_add_executor_job(
-                    # TODO: Check
-                    hass.data[DOMAIN]["api"][chargerNameInput].set_cable_lock_mode, cableLockModeEnum
-                )
-            except KeyError:
-                _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        else:
-            for charger in hass.data[DOMAIN]["api"].keys():
-                try:
-                    _LOGGER.debug(f"set set_cable_lock_mode for charger '{charger}' to {cableLockModeEnum}")
-                    # TODO: Check
-                    await hass.async_add_executor_job(
-                        hass.data[DOMAIN]["api"][charger].set_cable_lock_mode, cableLockModeEnum
-                    )
-                except KeyError:
-                    _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        await hass.data[DOMAIN]["coordinator"].async_refresh()
+        _LOGGER.debug(f"set set_cable_lock_mode for charger(s) '{chargerNameInput}' to {cableLockModeEnum}")
+        return await _async_send_commands(hass, chargerNameInput, "set_cable_lock_mode", cableLockModeEnum)
 
     async def async_handle_set_phase_mode(call):
         """Handle the service to set the phase mode."""
@@ -344,12 +641,7 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
             elif valid_entity_id(phaseModeInput):
                 phaseMode = int(hass.states.get(phaseModeInput).state)
             else:
-                _LOGGER.error(
-                    "No valid value for '%s': %s",
-                    SET_PHASE_MODE_ATTR,
-                    phaseModeInput,
-                )
-                return
+                raise ServiceValidationError(f"No valid value for '{SET_PHASE_MODE_ATTR}': {phaseModeInput}")
         else:
             phaseMode = phaseModeInput
 
@@ -359,28 +651,8 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
         if phaseMode >= 2:
             phaseModeEnum = Charger.PhaseModeEnum.three
 
-        if len(chargerNameInput) > 0:
-            _LOGGER.debug(f"set set_phase_mode for charger '{chargerNameInput}' to {phaseModeEnum}")
-            try:
-                await hass.async_add_executor_job(
-                    # TODO: Check
-                    hass.data[DOMAIN]["api"][chargerNameInput].set_phase_mode, phaseModeEnum
-                )
-            except KeyError:
-                _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        else:
-            for charger in hass.data[DOMAIN]["api"].keys():
-                try:
-                    _LOGGER.debug(f"set set_phase_mode for charger '{charger}' to {phaseModeEnum}")
-                    # TODO: Check
-                    await hass.async_add_executor_job(
-                        hass.data[DOMAIN]["api"][charger].set_phase_mode, phaseModeEnum
-                    )
-                except KeyError:
-                    _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        await hass.data[DOMAIN]["coordinator"].async_refresh()
+        _LOGGER.debug(f"set set_phase_mode for charger(s) '{chargerNameInput}' to {phaseModeEnum}")
+        return await _async_send_commands(hass, chargerNameInput, "set_phase_mode", phaseModeEnum)
 
     async def async_handle_set_charge_limit(call):
         """Handle the service call to set charge limit."""
@@ -392,56 +664,75 @@ async def async_setup(hass: core.HomeAssistant, config: dict) -> bool:
             elif valid_entity_id(chargeLimitInput):
                 chargeLimit = float(hass.states.get(chargeLimitInput).state)
             else:
-                _LOGGER.error(
-                    "No valid value for '%s': %s", CHARGE_LIMIT, chargeLimitInput
-                )
-                return
+                raise ServiceValidationError(f"No valid value for '{CHARGE_LIMIT}': {chargeLimitInput}")
         else:
             chargeLimit = chargeLimitInput
 
         if chargeLimit < 0:
             chargeLimit = 0
 
-        if len(chargerNameInput) > 0:
-            _LOGGER.debug(f"set set_charge_limit for charger '{chargerNameInput}' to {chargeLimit}")
-            try:
-                # TODO: Check
-                await hass.async_add_executor_job(
-                    hass.data[DOMAIN]["api"][chargerNameInput].set_charge_limit, chargeLimit
-                )
-            except KeyError:
-                _LOGGER.error(f"Charger with name '{chargerName}' not found!")
+        _LOGGER.debug(f"set set_charge_limit for charger(s) '{chargerNameInput}' to {chargeLimit}")
+        return await _async_send_commands(hass, chargerNameInput, "set_charge_limit", chargeLimit)
 
-        else:
-            for charger in hass.data[DOMAIN]["api"].keys():
-                try:
-                    _LOGGER.debug(f"set set_charge_limit for charger '{charger}' to {chargeLimit}")
-                    # TODO: Check
-                    await hass.async_add_executor_job(
-                        hass.data[DOMAIN]["api"][charger].set_charge_limit, chargeLimit
-                    )
-                except KeyError:
-                    _LOGGER.error(f"Charger with name '{chargerName}' not found!")
-
-        await hass.data[DOMAIN]["coordinator"].async_refresh()
-
-    hass.services.async_register(DOMAIN, "set_max_current", async_handle_set_max_current)
+    def get_service_value(value):
+        """Resolve a service value that may be given as an entity id."""
+        if isinstance(value, str) and valid_entity_id(value):
+            return hass.states.get(value).state
+        return value
+
+    async def async_handle_apply_settings(call):
+        """Handle the service call to apply several settings with one request per charger (API v2)."""
+        chargerNameInput = call.data.get(CHARGER_NAME_ATTR, '')
+        settings = {}
+        try:
+            if SET_MAX_CURRENT_ATTR in call.data:
+                maxCurrent = int(float(get_service_value(call.data[SET_MAX_CURRENT_ATTR])))
+                settings["maxCurrent"] = min(max(maxCurrent, 6), 32)
+            if SET_ABSOLUTE_MAX_CURRENT_ATTR in call.data:
+                absoluteMaxCurrent = int(float(get_service_value(call.data[SET_ABSOLUTE_MAX_CURRENT_ATTR])))
+                settings["absoluteMaxCurrent"] = min(max(absoluteMaxCurrent, 6), 32)
+            if SET_CABLE_LOCK_MODE_ATTR in call.data:
+                cableLockMode = int(float(get_service_value(call.data[SET_CABLE_LOCK_MODE_ATTR])))
+                settings["cableLockMode"] = Charger.CableLockMode(min(max(cableLockMode, 0), 2))
+            if CHARGE_LIMIT in call.data:
+                settings["chargeLimit"] = max(float(get_service_value(call.data[CHARGE_LIMIT])), 0)
+            if SET_PHASE_MODE_ATTR in call.data:
+                phaseMode = int(float(get_service_value(call.data[SET_PHASE_MODE_ATTR])))
+                settings["phaseMode"] = Charger.PhaseModeEnum.one if phaseMode == 1 else Charger.PhaseModeEnum.three
+            if SET_CHARGING_MODE_ATTR in call.data:
+                settings["chargingMode"] = Charger.ChargingModeEnum[str(get_service_value(call.data[SET_CHARGING_MODE_ATTR]))]
+        except (ValueError, TypeError, KeyError, AttributeError) as err:
+            raise ServiceValidationError(f"No valid value for apply_settings: {err}") from err
+
+        if not settings:
+            raise ServiceValidationError("apply_settings called without any setting")
+
+        _LOGGER.debug(f"apply settings for charger(s) '{chargerNameInput}': {settings}")
+        return await _async_send_commands(hass, chargerNameInput, "apply_settings", **settings)
+
+    # The services return the result per charger, if the Home Assistant version supports service responses
+    serviceOptions = {"supports_response": SupportsResponse.OPTIONAL} if SupportsResponse is not None else {}
+
+    hass.services.async_register(DOMAIN, "set_max_current", async_handle_set_max_current, **serviceOptions)
     hass.services.async_register(
-        DOMAIN, "set_absolute_max_current", async_handle_set_absolute_max_current
+        DOMAIN, "set_absolute_max_current", async_handle_set_absolute_max_current, **serviceOptions
     )
 
     if api_level == 1:
-        hass.services.async_register(DOMAIN, "set_cable_lock_mode", async_handle_set_cable_lock_mode)
+        hass.services.async_register(
+            DOMAIN, "set_cable_lock_mode", async_handle_set_cable_lock_mode, **serviceOptions
+        )
     elif api_level == 2:
-        hass.services.async_register(DOMAIN, "set_phase_mode", async_handle_set_phase_mode)
+        hass.services.async_register(DOMAIN, "set_phase_mode", async_handle_set_phase_mode, **serviceOptions)
 
-    hass.services.async_register(DOMAIN, "set_charge_limit", async_handle_set_charge_limit)
+    hass.services.async_register(DOMAIN, "set_charge_limit", async_handle_set_charge_limit, **serviceOptions)
+    hass.services.async_register(DOMAIN, "apply_settings", async_handle_apply_settings, **serviceOptions)
 
     hass.async_create_task(async_load_platform(
-        hass, "sensor", DOMAIN, {CONF_CHARGERS: chargers, CHARGER_API: chargerApi}, config)
+        hass, "sensor", DOMAIN, {CONF_CHARGERS: chargers, CHARGER_API: hass.data[DOMAIN]["api"]}, config)
     )
     hass.async_create_task(async_load_platform(
-        hass, "switch", DOMAIN, {CONF_CHARGERS: chargers, CHARGER_API: chargerApi}, config)
+        hass, "switch", DOMAIN, {CONF_CHARGERS: chargers, CHARGER_API: hass.data[DOMAIN]["api"]}, config)
     )
 
     return True
@@ -1,104 +1,554 @@
-from enum import Enum
-from goecharger import GoeCharger as GoeChargerV1
-from goecharger_api_lite import GoeCharger as GoeChargerV2
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import time
+from collections import Counter, deque
+from functools import partial
+
+import aiohttp
 
 import logging
 
+from .const import (
+    ATTRIBUTE_TIERS, STATUS_TIERS, TIER_LIVE, DEFAULT_COMMAND_WINDOW, DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_HEDGE_STATUS_READS,
+)
+from .protocol import (
+    CableLockMode, ChargingMode, PhaseMode, V2_REQUIRED_KEYS, REQUIRED_ATTRIBUTES, ChargerConnectionError,
+    InvalidAPILevelError, json_loads, load_backend,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
-class Charger:
-    def __init__(self, host, api_level):
-        _LOGGER.debug(f"Creating Charger at {host} with API {api_level}")
-        self.host = host
-        self.api_level = api_level
-        
-        if api_level == "1":
-            self.goecharger = GoeChargerV1(host)
-        elif api_level == "2":
-            self.goecharger = GoeChargerV2(host)
-        else:
-            raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-
-    def request_status(self):
-        if self.api_level == "1":
-            return self.goecharger.requestStatus()
-        elif self.api_level == "2":
-            # TODO: Check the return format with v1
-            return self.goecharger.get_status(status_type=GoeChargerV2.STATUS_FULL)
-        else:
-            raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-    
-    def set_tmp_max_current(self, maxCurrent):
-        if self.api_level == "1":
-            return self.goecharger.setTmpMaxCurrent(maxCurrent)
-        elif self.api_level == "2":
-            # TODO: Check
-            return self.goecharger.set_ampere(maxCurrent)
-        else:
-            raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-    
-    def set_absolute_max_current(self, absoluteMaxCurrent):
-        if self.api_level == "1":
-            return self.goecharger.setAbsoluteMaxCurrent(absoluteMaxCurrent)
-        elif self.api_level == "2":
-            # TODO: Implement in charging APIv2 (key ama)
-            # return self.goecharger.set_absolute_max_current(absoluteMaxCurrent)
-            return self.goecharger.set_key("ama", absoluteMaxCurrent)
-        else:
-            raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-    
-    def set_cable_lock_mode(self, cableLockModeEnum):
-        if self.api_level == "1":
-           return self.goecharger.setCableLockMode(cableLockModeEnum)
-        elif self.api_level == "2":
-            # TODO: Implement in charging APIv2 (key ust)
-            # return self.goecharger.set_cable_lock_mode(cableLockModeEnum)
-            return self.goecharger.set_key("ust", cableLockModeEnum)
-        else:
-            raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-    
-    def set_charge_limit(self, chargeLimit):
-        if self.api_level == "1":
-            return self.goecharger.setChargeLimit(chargeLimit)
-        elif self.api_level == "2":
-            # TODO: Implement in charging APIv2 (key dwo)
-            
-            # Conversion from kWh to Wh
-            chargeLimit = chargeLimit * 1000
-            # return self.goecharger.set_charge_limit(chargeLimit)
-            return self.goecharger.set_key("dwo", chargeLimit)
+# Timeout for a single HTTP request to the charger (in seconds), used until enough latencies were measured and as
+# upper bound of the adaptive timeout
+REQUEST_TIMEOUT = 5
+# Lower bound of the adaptive request timeout (in seconds)
+MIN_REQUEST_TIMEOUT = 1
+# The adaptive timeout is this multiple of the p95 latency
+TIMEOUT_P95_FACTOR = 3
+# Number of recent request latencies the p95 is computed from, and the minimum before it is used
+LATENCY_WINDOW = 50
+MIN_LATENCY_SAMPLES = 10
+# Weight of a new latency in the moving average
+LATENCY_EWMA_ALPHA = 0.2
+# How long an idle keep-alive connection to the charger is kept open (in seconds)
+KEEPALIVE_TIMEOUT = 60
+
+# Consecutive failed requests after which a charger is considered down
+BREAKER_FAILURE_THRESHOLD = 3
+# Backoff (in seconds) before the first recovery probe of a charger that is down, doubled on every failed probe
+BREAKER_BASE_DELAY = 30
+BREAKER_MAX_DELAY = 600
+# The backoff is randomized by +/- this fraction, so chargers that went down together aren't probed together
+BREAKER_JITTER = 0.2
+# Timeout of a recovery probe (in seconds), a charger that is still down shouldn't hold the queue for REQUEST_TIMEOUT
+PROBE_TIMEOUT = 2
+
+class _Superseded(Exception):
+    """Raised for a queued request that was replaced by a newer one."""
+
+    def __init__(self, replacement):
+        super().__init__()
+        self.replacement = replacement
+
+
+class RequestScheduler:
+    """Queue for the requests to a single charger.
+
+    At most concurrency requests run at the same time, commands run before queued status polls and a queued poll can
+    be superseded by a newer one, in which case its callers get the result of the newer poll.
+    """
+
+    PRIORITY_COMMAND = 0
+    PRIORITY_POLL = 1
+
+    def __init__(self, concurrency=DEFAULT_MAX_CONCURRENT_REQUESTS):
+        self._concurrency = concurrency
+        self._running = 0
+        self._queue = []
+        self._sequence = itertools.count()
+
+    async def async_run(self, request, priority, tag=None):
+        """Run request (a coroutine function) once a slot is free. Queued requests with a tag can be superseded."""
+        if self._running < self._concurrency and not self._queue:
+            self._running += 1
         else:
-            raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-    
-    def set_phase_mode(self, phaseModeEnum):
-        if self.api_level != "1":
-            raise InvalidAPILevelError("Invalid API level. Only APIv2 can switch the phase mode.")
-        
-        # TODO: Check
-        return self.goecharger.set_phase_mode(phaseModeEnum)
-
-    def set_allow_charging(self, allowCharging: bool):
-        if self.api_level == "1":
-            return self.goecharger.setAllowCharging(allowCharging)
-        elif self.api_level == "2":
-            # TODO: Check
-            if allowCharging:
-                return self.goecharger.set_charging_mode(GoeChargerV2.SettableValueEnum.ChargingMode.on)
+            slot = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (priority, next(self._sequence), slot, tag))
+            try:
+                await slot
+            except _Superseded as err:
+                return await asyncio.shield(err.replacement)
+            except asyncio.CancelledError:
+                # The slot was granted right before the cancellation, hand it on
+                if slot.done() and not slot.cancelled() and slot.exception() is None:
+                    self._release()
+                raise
+
+        try:
+            return await request()
+        finally:
+            self._release()
+
+    def supersede(self, covers, replacement):
+        """Drop the queued requests whose tag is covered by the replacement, their callers get its result."""
+        for priority, sequence, slot, tag in self._queue:
+            if tag is not None and not slot.done() and covers(tag):
+                slot.set_exception(_Superseded(replacement))
+
+    def _release(self):
+        self._running -= 1
+        while self._queue and self._running < self._concurrency:
+            slot = heapq.heappop(self._queue)[2]
+            if slot.done():
+                # superseded or cancelled while queued
+                continue
+            self._running += 1
+            slot.set_result(None)
+
+
+class LatencyTracker:
+    """Moving average and p95 of the request latencies of a charger, used to derive its timeouts."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.ewma = None
+        self._samples = deque(maxlen=window)
+        self._p95 = None
+
+    def record(self, latency):
+        self.ewma = latency if self.ewma is None else self.ewma + LATENCY_EWMA_ALPHA * (latency - self.ewma)
+        self._samples.append(latency)
+        self._p95 = None
+
+    @property
+    def p95(self):
+        """The p95 latency in seconds, None until MIN_LATENCY_SAMPLES were recorded."""
+        if self._p95 is None and len(self._samples) >= MIN_LATENCY_SAMPLES:
+            samples = sorted(self._samples)
+            self._p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return self._p95
+
+    @property
+    def timeout(self):
+        """Timeout for the next request, a multiple of the p95 latency within MIN_REQUEST_TIMEOUT and REQUEST_TIMEOUT."""
+        p95 = self.p95
+        if p95 is None:
+            return REQUEST_TIMEOUT
+        return min(REQUEST_TIMEOUT, max(MIN_REQUEST_TIMEOUT, p95 * TIMEOUT_P95_FACTOR, self.ewma * TIMEOUT_P95_FACTOR))
+
+
+class ChargerHealth:
+    """Circuit breaker tracking whether a charger is reachable.
+
+    healthy -> degraded on a failed request, degraded -> open after BREAKER_FAILURE_THRESHOLD consecutive failures.
+    While open no status is requested until the (jittered, exponential) backoff expired, then a single probe is let
+    through (half-open). A successful request closes the breaker again, a failed probe re-opens it with a longer backoff.
+    """
+
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failureThreshold=BREAKER_FAILURE_THRESHOLD, baseDelay=BREAKER_BASE_DELAY,
+                 maxDelay=BREAKER_MAX_DELAY):
+        self._name = name
+        self._failureThreshold = failureThreshold
+        self._baseDelay = baseDelay
+        self._maxDelay = maxDelay
+        self.state = self.HEALTHY
+        self.failures = 0
+        self._retryAt = 0
+
+    @property
+    def available(self):
+        return self.state in (self.HEALTHY, self.DEGRADED)
+
+    @property
+    def retry_in(self):
+        """Seconds until the next probe is allowed."""
+        return max(0, self._retryAt - time.monotonic())
+
+    def allow_request(self):
+        """Check if a status request may be sent, moving an open breaker to half-open once the backoff expired."""
+        if self.state == self.OPEN:
+            if time.monotonic() < self._retryAt:
+                return False
+            _LOGGER.debug(f"probing charger {self._name}")
+            self.state = self.HALF_OPEN
+        return True
+
+    def record_success(self):
+        if self.state in (self.OPEN, self.HALF_OPEN):
+            _LOGGER.info(f"Charger {self._name} is reachable again")
+        self.state = self.HEALTHY
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self._failureThreshold:
+            delay = min(self._baseDelay * 2 ** max(0, self.failures - self._failureThreshold), self._maxDelay)
+            delay *= random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+            if self.state in (self.HEALTHY, self.DEGRADED):
+                _LOGGER.warning(f"Charger {self._name} is unreachable, retrying in {delay:.0f}s")
             else:
-                return self.goecharger.set_charging_mode(GoeChargerV2.SettableValueEnum.ChargingMode.off)
+                _LOGGER.debug(f"Charger {self._name} is still unreachable, retrying in {delay:.0f}s")
+            self.state = self.OPEN
+            self._retryAt = time.monotonic() + delay
         else:
-            raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-    
-    class CableLockMode(Enum):
-        UNLOCKCARFIRST = 0
-        AUTOMATIC = 1
-        LOCKED = 2
-
-    # TODO: Eventually allow setting to auto
-    @property
-    def PhaseModeEnum(self):
-        return GoeChargerV2.SettableValueEnum.PhaseMode
-    
+            self.state = self.DEGRADED
+
+
+class CommandCoalescer:
+    """Coalesce rapid writes of a single setting.
+
+    Only the latest requested value is written, values equal to the last confirmed one are skipped and at most one
+    write is sent per window. A confirmed value is only trusted for one window, the setting can also be changed on the
+    charger itself (e.g. in the app) and the status is not read that often.
+    """
+
+    def __init__(self, write, window):
+        self._write = write
+        self.window = window
+        self._confirmed = None
+        self._confirmedAt = None
+        self._pending = None
+        self._lastWrite = None
+        self._flushTask = None
+
+    def confirm(self, value):
+        """Update the confirmed value from a status read, unless a write is in progress."""
+        if self._flushTask is None:
+            self._set_confirmed(value)
+
+    def _set_confirmed(self, value):
+        self._confirmed = value
+        self._confirmedAt = time.monotonic()
+
+    def _is_confirmed(self, value):
+        """Check if the charger is known to have value, i.e. it was confirmed within the last window."""
+        return (
+            value == self._confirmed
+            and self._confirmedAt is not None
+            and time.monotonic() - self._confirmedAt <= self.window
+        )
+
+    async def async_set(self, value):
+        """Request a write of value, returns the result of the write or None if the value was skipped or superseded."""
+        if self._flushTask is None and self._is_confirmed(value):
+            return None
+
+        if self._pending is not None:
+            # Superseded by the newer value
+            self._pending[1].set_result(None)
+        future = asyncio.get_running_loop().create_future()
+        self._pending = (value, future)
+
+        if self._flushTask is None:
+            delay = 0
+            if self._lastWrite is not None:
+                delay = max(0, self.window - (time.monotonic() - self._lastWrite))
+            self._flushTask = asyncio.create_task(self._async_flush(delay))
+        return await future
+
+    async def _async_flush(self, delay):
+        # Value written by this flush, a later request for the same value is skipped even after the window expired
+        written = None
+        try:
+            while self._pending is not None:
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                value, future = self._pending
+                self._pending = None
+                if value == written or self._is_confirmed(value):
+                    future.set_result(None)
+                    delay = 0
+                    continue
+
+                self._lastWrite = time.monotonic()
+                try:
+                    result = await self._write(value)
+                except Exception as err:
+                    future.set_exception(err)
+                else:
+                    self._set_confirmed(value)
+                    written = value
+                    future.set_result(result)
+                delay = self.window
+        finally:
+            if self._pending is not None and not self._pending[1].done():
+                self._pending[1].cancel()
+            self._pending = None
+            self._flushTask = None
+
+
+class Charger:
+    def __init__(self, host, api_level, commandWindow=DEFAULT_COMMAND_WINDOW,
+                 maxConcurrentRequests=DEFAULT_MAX_CONCURRENT_REQUESTS, hedgeStatusReads=DEFAULT_HEDGE_STATUS_READS):
+        _LOGGER.debug(f"Creating Charger at {host} with API {api_level}")
+        self.host = host
+        self.api_level = str(api_level)
+        self._session = None
+        # All requests to the charger go through this queue, the ESP32 can't handle many concurrent requests
+        self._maxConcurrentRequests = maxConcurrentRequests
+        self._scheduler = RequestScheduler(maxConcurrentRequests)
+        self.health = ChargerHealth(host)
+        self.latency = LatencyTracker()
+        # Status reads slower than the p95 latency get a second request on an extra connection
+        self._hedgeStatusReads = hedgeStatusReads
+        self._maxCurrentCommand = CommandCoalescer(self._async_write_tmp_max_current, commandWindow)
+        self._statusConsumers = Counter()
+        self._statusFilters = {}
+        # Attributes decoded from a status response, None decodes all of them
+        self._decodeAttributes = None
+        # Status requests in flight by path, concurrent callers share the pending result
+        self._pendingStatus = {}
+
+        # The protocol adapter is chosen once, it decodes every status into the attribute names of the v1 status
+        self._protocol = load_backend(self.api_level)()
+
+    def _get_session(self):
+        """Return the keep-alive HTTP session of this charger, creating it on first use."""
+        if self._session is None or self._session.closed:
+            # The chargers are small ESP32 devices, keep persistent connections instead of opening a new one per request
+            # One extra connection for a hedged status read, the request queue bounds all other requests. It is kept
+            # even without hedging, so hedging can be switched on without recreating the session.
+            connector = aiohttp.TCPConnector(
+                limit=self._maxConcurrentRequests + 1,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            # Every request sets its own (adaptive) timeout
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def set_options(self, commandWindow=DEFAULT_COMMAND_WINDOW, hedgeStatusReads=DEFAULT_HEDGE_STATUS_READS):
+        """Change the options of a (shared) charger, they apply to the next command and status read."""
+        self._maxCurrentCommand.window = commandWindow
+        self._hedgeStatusReads = hedgeStatusReads
+
+    def get_options(self):
+        return {"commandWindow": self._maxCurrentCommand.window, "hedgeStatusReads": self._hedgeStatusReads}
+
+    async def async_close(self):
+        """Close the HTTP session of this charger."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def add_status_consumer(self, attribute):
+        """Register an (enabled) entity reading the given status attribute."""
+        self._statusConsumers[attribute] += 1
+        self._consumers_changed()
+
+    def remove_status_consumer(self, attribute):
+        """Unregister an entity reading the given status attribute."""
+        self._statusConsumers[attribute] -= 1
+        if self._statusConsumers[attribute] <= 0:
+            del self._statusConsumers[attribute]
+        self._consumers_changed()
+
+    def _consumers_changed(self):
+        self._statusFilters = {}
+        # Nobody registered yet (e.g. during the first refresh), decode everything
+        self._decodeAttributes = REQUIRED_ATTRIBUTES.union(self._statusConsumers) if self._statusConsumers else None
+
+    def _get_status_filter(self, tiers):
+        """Return the API v2 keys needed by the registered consumers of the given tiers, or None to request the full status."""
+        if tiers not in self._statusFilters:
+            keys = set(V2_REQUIRED_KEYS)
+            for attribute in self._statusConsumers:
+                if ATTRIBUTE_TIERS.get(attribute, TIER_LIVE) not in tiers:
+                    continue
+                attributeKeys = self._protocol.status_keys(attribute)
+                if attributeKeys is None:
+                    # Unknown mapping, better fetch everything than miss a value
+                    keys = None
+                    break
+                keys.update(attributeKeys)
+            # Nobody registered yet (e.g. during the first refresh), fetch the full status
+            self._statusFilters[tiers] = tuple(sorted(keys)) if keys and self._statusConsumers else None
+        return self._statusFilters[tiers]
+
+    async def _async_request(self, path, params=None, priority=RequestScheduler.PRIORITY_COMMAND, tag=None,
+                             timeout=None):
+        """Send a request through the request queue of the charger."""
+        return await self._scheduler.async_run(partial(self._async_http_get, path, params, timeout), priority, tag)
+
+    async def _async_http_get(self, path, params=None, timeout=None):
+        url = f"http://{self.host}{path}"
+        if timeout is None:
+            timeout = self.latency.timeout
+        started = time.monotonic()
+        try:
+            async with self._get_session().get(
+                url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 404 and self._protocol.supportsStatusFilter:
+                    raise ChargerConnectionError(f"HTTP API v2 not enabled on charger {self.host}")
+                # v2 answers 500 for rejected keys, the body tells which key failed
+                if response.status != 500:
+                    response.raise_for_status()
+                # The v1 API does not always send a JSON content type
+                result = await response.json(content_type=None, loads=json_loads)
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as err:
+            if isinstance(err, asyncio.TimeoutError):
+                # Count the timeout as a slow request, so the timeout grows on a slow connection
+                self.latency.record(timeout)
+            self.health.record_failure()
+            raise ChargerConnectionError(f"Error communicating with charger {self.host}: {err}") from err
+        self.latency.record(time.monotonic() - started)
+        self.health.record_success()
+        return result
+
+    async def _async_hedged_get(self, path, timeout=None):
+        """GET an idempotent path, sending a second request if the first one takes longer than the p95 latency."""
+        hedgeDelay = self.latency.p95 if self._hedgeStatusReads and timeout is None else None
+        if hedgeDelay is None:
+            return await self._async_http_get(path, timeout=timeout)
+
+        requests = [asyncio.ensure_future(self._async_http_get(path))]
+        try:
+            done, pending = await asyncio.wait(requests, timeout=hedgeDelay)
+            if done:
+                return requests[0].result()
+            _LOGGER.debug(f"no response from charger {self.host} after {hedgeDelay:.2f}s, hedging {path}")
+            requests.append(asyncio.ensure_future(self._async_http_get(path)))
+            pending = set(requests)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for request in done:
+                    if request.exception() is None:
+                        return request.result()
+            # Both failed
+            return requests[0].result()
+        finally:
+            for request in requests:
+                request.cancel()
+
+    async def request_status(self, tiers=frozenset(STATUS_TIERS)):
+        """Request the status of the charger.
+
+        For API v2 only the keys of the given tiers are requested, API v1 always returns the full status. Concurrent
+        requests for the same keys share a single request to the charger. While the charger is down (see ChargerHealth)
+        this raises ChargerUnavailableError without sending a request.
+        """
+        if not self.health.allow_request():
+            raise ChargerUnavailableError(
+                f"Charger {self.host} is unreachable, next try in {self.health.retry_in:.0f}s"
+            )
+        statusFilter = self._get_status_filter(frozenset(tiers)) if self._protocol.supportsStatusFilter else None
+        path = self._protocol.status_path(statusFilter)
+        keys = frozenset(statusFilter) if statusFilter else _ALL_KEYS
+
+        task = self._pendingStatus.get(path)
+        if task is None:
+            # A recovery probe gets a short timeout
+            timeout = PROBE_TIMEOUT if self.health.state == ChargerHealth.HALF_OPEN else None
+            response = asyncio.ensure_future(self._scheduler.async_run(
+                partial(self._async_hedged_get, path, timeout), RequestScheduler.PRIORITY_POLL, keys
+            ))
+            task = asyncio.ensure_future(self._async_read_status(response))
+            self._pendingStatus[path] = task
+            task.add_done_callback(partial(self._status_request_done, path))
+            # Queued polls for a subset of these keys are dropped in favour of this one, they get its (undecoded)
+            # response and decode it themselves
+            self._scheduler.supersede(partial(_covers, keys), response)
+        # A caller giving up (e.g. on a timeout) must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _status_request_done(self, path, task):
+        self._pendingStatus.pop(path, None)
+        if not task.cancelled():
+            # Retrieve the exception, in case all callers already gave up
+            task.exception()
+
+    async def _async_read_status(self, response):
+        return self.decode_status_update(await response)
+
+    def decode_status_update(self, values):
+        """Decode (a part of) a status, as read from the charger or pushed by it, into attributes."""
+        status = self._protocol.decode_status(values, self._decodeAttributes)
+        maxCurrent = status.get('charger_max_current')
+        if maxCurrent is not None:
+            self._maxCurrentCommand.confirm(maxCurrent)
+        return status
+
+    # The setters below return the written attributes as confirmed by the charger. If given, optimistic is called
+    # with the expected attributes before the command is sent.
+
+    async def _async_write(self, settings, optimistic=None):
+        """Write the settings (by attribute name) and return the written attributes as confirmed by the charger."""
+        return await self._protocol.async_write(self._async_request, settings, optimistic)
+
+    async def set_tmp_max_current(self, maxCurrent, optimistic=None):
+        """Set the max current, rapid calls are coalesced. Returns None if the value was skipped or superseded."""
+        maxCurrent = int(maxCurrent)
+        if optimistic is not None:
+            optimistic({'charger_max_current': maxCurrent})
+        return await self._maxCurrentCommand.async_set(maxCurrent)
+
+    async def _async_write_tmp_max_current(self, maxCurrent):
+        return await self._async_write({'charger_max_current': maxCurrent})
+
+    async def set_absolute_max_current(self, absoluteMaxCurrent, optimistic=None):
+        return await self._async_write({'charger_absolute_max_current': int(absoluteMaxCurrent)}, optimistic)
+
+    async def set_cable_lock_mode(self, cableLockModeEnum, optimistic=None):
+        return await self._async_write({'cable_lock_mode': cableLockModeEnum.value}, optimistic)
+
+    async def set_charge_limit(self, chargeLimit, optimistic=None):
+        return await self._async_write({'charge_limit': chargeLimit}, optimistic)
+
+    async def set_phase_mode(self, phaseModeEnum, optimistic=None):
+        return await self._async_write({'phase_mode': phaseModeEnum.name}, optimistic)
+
+    async def set_allow_charging(self, allowCharging: bool, optimistic=None):
+        return await self._async_write({'allow_charging': 'on' if allowCharging else 'off'}, optimistic)
+
+    async def apply_settings(self, maxCurrent=None, absoluteMaxCurrent=None, cableLockMode=None, chargeLimit=None,
+                             phaseMode=None, chargingMode=None, optimistic=None):
+        """Apply several settings at once, only the given (not None) settings are changed.
+
+        API v2 sets all keys with a single request followed by one confirmation read, API v1 needs one write per
+        key and takes the confirmation from the response of the last write.
+        """
+        settings = {}
+        if maxCurrent is not None:
+            settings['charger_max_current'] = int(maxCurrent)
+        if absoluteMaxCurrent is not None:
+            settings['charger_absolute_max_current'] = int(absoluteMaxCurrent)
+        if cableLockMode is not None:
+            settings['cable_lock_mode'] = cableLockMode.value
+        if chargeLimit is not None:
+            settings['charge_limit'] = chargeLimit
+        if phaseMode is not None:
+            settings['phase_mode'] = phaseMode.name
+        if chargingMode is not None:
+            settings['charging_mode'] = chargingMode.name
+        confirmed = await self._async_write(settings, optimistic)
+
+        if maxCurrent is not None:
+            self._maxCurrentCommand.confirm(int(maxCurrent))
+        return confirmed
+
+    CableLockMode = CableLockMode
+    PhaseModeEnum = PhaseMode
+    ChargingModeEnum = ChargingMode
+
+
+# Tag of a status poll requesting all keys
+_ALL_KEYS = "all"
+
+
+def _covers(keys, queuedKeys):
+    """Check if a poll for keys also returns all the keys of a queued poll."""
+    if keys == _ALL_KEYS:
+        return True
+    return queuedKeys != _ALL_KEYS and queuedKeys <= keys
+
 
-class InvalidAPILevelError(ValueError):
-    pass
+class ChargerUnavailableError(ChargerConnectionError):
+    """Raised instead of sending a request while a charger is known to be down."""
@@ -11,7 +11,12 @@ from homeassistant.helpers import selector
 from homeassistant.data_entry_flow import FlowResult
 
 from homeassistant.const import CONF_HOST, CONF_SCAN_INTERVAL
-from .const import DOMAIN, CONF_NAME, CONF_CORRECTION_FACTOR, CONF_API_LEVEL
+from .const import (
+    DOMAIN, CONF_NAME, CONF_CORRECTION_FACTOR, CONF_API_LEVEL,
+    CONF_DEADBAND_VOLTAGE, CONF_DEADBAND_POWER_FACTOR, CONF_DEADBAND_TEMPERATURE, CONF_DEADBAND_RELATIVE,
+    CONF_DEADBAND_MAX_SILENCE, DEFAULT_DEADBAND_MAX_SILENCE, CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW,
+    CONF_HEDGE_STATUS_READS, DEFAULT_HEDGE_STATUS_READS, CONF_PUSH_TOPIC, DEFAULT_PUSH_TOPIC,
+)
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -25,7 +30,7 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
 
     @staticmethod
     @callback
-    async def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
         return OptionsFlowHandler(config_entry)
 
     async def async_step_user(self, info):
@@ -63,6 +68,7 @@ class OptionsFlowHandler(OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        options = self.config_entry.options
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -77,6 +83,34 @@ class OptionsFlowHandler(OptionsFlow):
                     vol.Required(CONF_API_LEVEL, default="1"): selector.selector(
                         {"select": {"mode": "dropdown", "options": ["1", "2"]}}
                     ),
+                    # Changes smaller than the deadband are not published (0 disables the deadband)
+                    vol.Optional(
+                        CONF_DEADBAND_VOLTAGE, default=options.get(CONF_DEADBAND_VOLTAGE, 0)
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_DEADBAND_POWER_FACTOR, default=options.get(CONF_DEADBAND_POWER_FACTOR, 0)
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_DEADBAND_TEMPERATURE, default=options.get(CONF_DEADBAND_TEMPERATURE, 0)
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_DEADBAND_RELATIVE, default=options.get(CONF_DEADBAND_RELATIVE, 0)
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_DEADBAND_MAX_SILENCE,
+                        default=options.get(CONF_DEADBAND_MAX_SILENCE, DEFAULT_DEADBAND_MAX_SILENCE),
+                    ): int,
+                    vol.Optional(
+                        CONF_COMMAND_WINDOW, default=options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW)
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_HEDGE_STATUS_READS,
+                        default=options.get(CONF_HEDGE_STATUS_READS, DEFAULT_HEDGE_STATUS_READS),
+                    ): bool,
+                    # Only API v2 chargers publish their status via MQTT
+                    vol.Optional(
+                        CONF_PUSH_TOPIC, default=options.get(CONF_PUSH_TOPIC, DEFAULT_PUSH_TOPIC)
+                    ): str,
                 }
             )
         )
\ No newline at end of file
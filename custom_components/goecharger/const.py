@@ -6,3 +6,54 @@ CONF_CORRECTION_FACTOR = "correction_factor"
 CONF_API_LEVEL = "api_level"
 CHARGER_API = "charger_api"
 
+# Refresh tiers of the charger status
+TIER_STATIC = "static"
+TIER_CONFIG = "config"
+TIER_LIVE = "live"
+STATUS_TIERS = (TIER_STATIC, TIER_CONFIG, TIER_LIVE)
+
+# Tier of the status attributes, attributes not listed here are live measurements or state (e.g. allow_charging,
+# which API v2 computes from the current state of the charger)
+ATTRIBUTE_TIERS = {
+    # device metadata, only fetched at startup and after a reconnect
+    'firmware': TIER_STATIC,
+    'serial_number': TIER_STATIC,
+    'wifi_ssid': TIER_STATIC,
+    'timezone_offset': TIER_STATIC,
+    'timezone_dst_offset': TIER_STATIC,
+    'adapter': TIER_STATIC,
+    'device_model': TIER_STATIC,
+    # configuration, refreshed on a slow timer and after a service call
+    'charger_max_current': TIER_CONFIG,
+    'charger_absolute_max_current': TIER_CONFIG,
+    'charger_access': TIER_CONFIG,
+    'stop_mode': TIER_CONFIG,
+    'cable_lock_mode': TIER_CONFIG,
+    'charge_limit': TIER_CONFIG,
+    'wifi_enabled': TIER_CONFIG,
+    'phase_mode': TIER_CONFIG,
+    'charging_mode': TIER_CONFIG,
+}
+
+# Deadband options to suppress insignificant changes of noisy sensors
+CONF_DEADBAND_VOLTAGE = "deadband_voltage"
+CONF_DEADBAND_POWER_FACTOR = "deadband_power_factor"
+CONF_DEADBAND_TEMPERATURE = "deadband_temperature"
+CONF_DEADBAND_RELATIVE = "deadband_relative"
+CONF_DEADBAND_MAX_SILENCE = "deadband_max_silence"
+DEFAULT_DEADBAND_MAX_SILENCE = 300
+
+# Window in seconds in which rapid max current commands are coalesced into a single write
+CONF_COMMAND_WINDOW = "command_window"
+DEFAULT_COMMAND_WINDOW = 2
+
+# Maximum number of requests sent to a charger at the same time
+DEFAULT_MAX_CONCURRENT_REQUESTS = 1
+
+# Send a second status request to a charger when the first is slower than its p95 latency
+CONF_HEDGE_STATUS_READS = "hedge_status_reads"
+DEFAULT_HEDGE_STATUS_READS = False
+
+# MQTT topic (e.g. go-eCharger/<serial>) an API v2 charger publishes its status to, empty to only poll the charger
+CONF_PUSH_TOPIC = "push_topic"
+DEFAULT_PUSH_TOPIC = ""
@@ -0,0 +1,339 @@
+import json
+import logging
+from enum import Enum
+
+try:
+    # orjson parses a full status several times faster, it ships with Home Assistant
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CableLockMode(Enum):
+    UNLOCKCARFIRST = 0
+    AUTOMATIC = 1
+    LOCKED = 2
+
+
+# Values of the v2 keys psm and frc
+# TODO: Eventually allow setting to auto
+class PhaseMode(Enum):
+    auto = 0
+    one = 1
+    three = 2
+
+
+class ChargingMode(Enum):
+    neutral = 0
+    off = 1
+    on = 2
+
+
+# Car status as reported by API v1 (and normalized for API v2)
+CAR_STATUS_V2 = {
+    0: 'unknown',
+    1: 'Charger ready, no vehicle',
+    2: 'charging',
+    3: 'Waiting for vehicle',
+    4: 'charging finished, vehicle still connected',
+    5: 'error',
+}
+
+ERROR_V2 = {
+    0: 'OK',
+    1: 'FI_AC',
+    2: 'FI_DC',
+    3: 'PHASE',
+    4: 'OVERVOLT',
+    5: 'OVERAMP',
+    6: 'DIODE',
+    7: 'PP_INVALID',
+    8: 'NO_GROUND',
+    9: 'CONTACTOR_STUCK',
+    10: 'CONTACTOR_MISS',
+    11: 'FI_UNKNOWN',
+    12: 'UNKNOWN',
+    13: 'OVERTEMP',
+    14: 'NO_COMM',
+    15: 'STATUS_LOCK_STUCK_OPEN',
+    16: 'STATUS_LOCK_STUCK_LOCKED',
+}
+
+DEVICE_MODEL_V2 = {
+    11: '11KW/16A',
+    22: '22KW/32A',
+}
+
+
+def _lookup(table, default='unknown'):
+    return lambda value: table.get(value, default)
+
+
+def _scaled(divisor):
+    """Scale a numeric value, None (e.g. no limit set) becomes 0."""
+    return lambda value: value / divisor if value is not None else 0
+
+
+def _average(values):
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def _rounded(value):
+    return round(value, 2) if value is not None else 0
+
+
+# API v2 status key -> (attribute, transform) into the attribute names and units of the API v1 status. Keys holding an
+# array map to a tuple of (attribute, index, transform) entries instead, an index of None passes the whole array.
+# Values are scaled here once per poll, the entities only read them.
+V2_STATUS_KEYS = {
+    'car': ('car_status', _lookup(CAR_STATUS_V2)),
+    'amp': ('charger_max_current', int),
+    'ama': ('charger_absolute_max_current', int),
+    'acu': ('ampere', lambda value: value or 0),
+    'err': ('charger_err', _lookup(ERROR_V2, 'UNKNOWN')),
+    'alw': ('allow_charging', lambda value: 'on' if value else 'off'),
+    'frc': ('charging_mode', lambda value: ChargingMode(value).name),
+    'psm': ('phase_mode', lambda value: PhaseMode(value).name),
+    'ust': ('cable_lock_mode', int),
+    'cbl': ('cable_max_current', lambda value: value or 0),
+    # Wh -> kWh
+    'dwo': ('charge_limit', _scaled(1000)),
+    'eto': ('energy_total', _scaled(1000)),
+    'wh': ('current_session_charged_energy', _scaled(1000)),
+    'tma': (
+        ('charger_temp', None, _average),
+        ('charger_temp0', 0, _rounded),
+        ('charger_temp1', 1, _rounded),
+    ),
+    # Voltages (V), currents (A), powers (W -> kW) and power factors (%)
+    'nrg': (
+        ('u_l1', 0, _rounded),
+        ('u_l2', 1, _rounded),
+        ('u_l3', 2, _rounded),
+        ('u_n', 3, _rounded),
+        ('i_l1', 4, _rounded),
+        ('i_l2', 5, _rounded),
+        ('i_l3', 6, _rounded),
+        ('p_l1', 7, _scaled(1000)),
+        ('p_l2', 8, _scaled(1000)),
+        ('p_l3', 9, _scaled(1000)),
+        ('p_n', 10, _scaled(1000)),
+        ('p_all', 11, _scaled(1000)),
+        ('lf_l1', 12, _rounded),
+        ('lf_l2', 13, _rounded),
+        ('lf_l3', 14, _rounded),
+        ('lf_n', 15, _rounded),
+    ),
+    'var': ('device_model', _lookup(DEVICE_MODEL_V2)),
+    'fwv': ('firmware', str),
+    'sse': ('serial_number', str),
+}
+
+# Attribute -> API v2 keys needed to read it
+V2_ATTRIBUTE_KEYS = {}
+for _key, _mapping in V2_STATUS_KEYS.items():
+    for _attribute in ([_mapping[0]] if isinstance(_mapping[0], str) else [entry[0] for entry in _mapping]):
+        V2_ATTRIBUTE_KEYS.setdefault(_attribute, ())
+        V2_ATTRIBUTE_KEYS[_attribute] += (_key,)
+del _key, _mapping, _attribute
+
+# Keys every v2 status request contains, the poll interval adapts to the car status
+V2_REQUIRED_KEYS = ('car',)
+# Attributes that are always decoded, even without an entity reading them
+REQUIRED_ATTRIBUTES = frozenset(('car_status', 'charger_max_current'))
+# Number of cached decode plans (one per set of consumed attributes)
+MAX_DECODE_PLANS = 8
+
+
+def _encode_allow_charging_v1(value):
+    if value not in ('on', 'off'):
+        raise InvalidAPILevelError("Invalid API level. Only APIv2 supports the neutral charging mode.")
+    return 1 if value == 'on' else 0
+
+
+def _encode_charge_limit_v1(chargeLimit):
+    # The v1 API expects the limit in 0.1 kWh steps
+    return int(chargeLimit * 10) if chargeLimit >= 0 else 0
+
+
+# Setting -> (key, encode, attribute) of the writable values, a setting is named after the attribute it changes
+V1_SETTINGS = {
+    # amx changes the max current without writing it to the flash of the charger
+    'charger_max_current': ('amx', int, 'charger_max_current'),
+    'charger_absolute_max_current': ('ama', int, 'charger_absolute_max_current'),
+    'cable_lock_mode': ('ust', int, 'cable_lock_mode'),
+    'charge_limit': ('dwo', _encode_charge_limit_v1, 'charge_limit'),
+    'allow_charging': ('alw', _encode_allow_charging_v1, 'allow_charging'),
+    # v1 has no forced state, on/off maps to allow charging
+    'charging_mode': ('alw', _encode_allow_charging_v1, 'allow_charging'),
+}
+
+V2_SETTINGS = {
+    'charger_max_current': ('amp', int, 'charger_max_current'),
+    'charger_absolute_max_current': ('ama', int, 'charger_absolute_max_current'),
+    'cable_lock_mode': ('ust', int, 'cable_lock_mode'),
+    # kWh -> Wh
+    'charge_limit': ('dwo', lambda chargeLimit: chargeLimit * 1000, 'charge_limit'),
+    'phase_mode': ('psm', lambda name: PhaseMode[name].value, 'phase_mode'),
+    'charging_mode': ('frc', lambda name: ChargingMode[name].value, 'charging_mode'),
+    # TODO: Check
+    'allow_charging': ('frc', lambda value: (ChargingMode.on if value == 'on' else ChargingMode.off).value, 'allow_charging'),
+}
+
+
+# Status mapper of the v1 backend, imported on first use
+_v1StatusMapper = None
+
+
+def load_backend(api_level):
+    """Return the protocol adapter of an API level, importing its backend on first use.
+
+    The v1 status is mapped by the goecharger library, which (with its HTTP stack) is only imported if a v1 charger
+    is in use. The import is blocking, so call this in an executor before the first Charger of an API level is created.
+    API v2 is decoded with the tables above and needs no backend.
+    """
+    global _v1StatusMapper
+    api_level = str(api_level)
+    if api_level == "1":
+        if _v1StatusMapper is None:
+            from goecharger.goecharger import GoeChargerStatusMapper
+            _v1StatusMapper = GoeChargerStatusMapper()
+            _LOGGER.debug("loaded backend for API 1")
+        return ProtocolV1
+    if api_level == "2":
+        return ProtocolV2
+    raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
+
+
+class ProtocolV1:
+    """go-e HTTP API v1: /status returns the full status, /mqtt?payload=key=value writes a key and returns the status."""
+
+    api_level = "1"
+    supportsStatusFilter = False
+    settings = V1_SETTINGS
+
+    def status_path(self, statusFilter):
+        return "/status"
+
+    def status_keys(self, attribute):
+        return None
+
+    def decode_status(self, response, attributes=None):
+        # The v1 library always maps the full status
+        return _v1StatusMapper.mapApiStatusResponse(response)
+
+    def encode_settings(self, settings):
+        """Return the (key, value) writes and the expected attributes for the given settings."""
+        writes = {}
+        expected = {}
+        for setting, value in settings.items():
+            if setting not in self.settings:
+                raise InvalidAPILevelError(f"Invalid API level. API v{self.api_level} can't set '{setting}'.")
+            key, encode, attribute = self.settings[setting]
+            writes[key] = encode(value)
+            expected[attribute] = value
+        return writes, expected
+
+    async def async_write(self, request, settings, optimistic=None):
+        """Write the settings and return the written attributes as confirmed by the charger.
+
+        The v1 API needs one request per key and answers each write with its full status, the confirmation is taken
+        from the response of the last write.
+        """
+        writes, expected = self.encode_settings(settings)
+        if not writes:
+            return {}
+        if optimistic is not None:
+            optimistic(expected)
+        for key, value in writes.items():
+            # The v1 API expects the payload unencoded in the query string
+            status = self.decode_status(await request(f"/mqtt?payload={key}={value}"))
+        return {attribute: status.get(attribute) for attribute in expected}
+
+
+class ProtocolV2(ProtocolV1):
+    """go-e HTTP API v2: /api/status?filter=keys returns the given keys, /api/set?key=json sets several keys at once."""
+
+    api_level = "2"
+    supportsStatusFilter = True
+    settings = V2_SETTINGS
+
+    def status_path(self, statusFilter):
+        return f"/api/status?filter={','.join(statusFilter)}" if statusFilter else "/api/status"
+
+    def __init__(self):
+        self._plans = {}
+
+    def status_keys(self, attribute):
+        return V2_ATTRIBUTE_KEYS.get(attribute)
+
+    def _get_plan(self, attributes):
+        """Return the part of V2_STATUS_KEYS decoding the given attributes (all attributes if None)."""
+        if attributes is None:
+            return V2_STATUS_KEYS
+        plan = self._plans.get(attributes)
+        if plan is None:
+            plan = {}
+            for key, mapping in V2_STATUS_KEYS.items():
+                if isinstance(mapping[0], str):
+                    if mapping[0] in attributes:
+                        plan[key] = mapping
+                    continue
+                entries = tuple(entry for entry in mapping if entry[0] in attributes)
+                if entries:
+                    plan[key] = entries
+            if len(self._plans) >= MAX_DECODE_PLANS:
+                self._plans.clear()
+            self._plans[attributes] = plan
+        return plan
+
+    def decode_status(self, response, attributes=None):
+        """Normalize a v2 status into the attribute names and units of the v1 status, unknown keys are dropped.
+
+        If attributes is given, only these attributes are decoded. The values of e.g. the nrg array nobody reads
+        are skipped, they are decoded as soon as an entity registers for them.
+        """
+        plan = self._get_plan(attributes)
+        status = {}
+        for key, value in response.items():
+            mapping = plan.get(key)
+            if mapping is None:
+                continue
+            if isinstance(mapping[0], str):
+                status[mapping[0]] = mapping[1](value)
+                continue
+            for attribute, index, transform in mapping:
+                if index is None:
+                    status[attribute] = transform(value or [])
+                else:
+                    status[attribute] = transform(value[index]) if value is not None and index < len(value) else None
+        return status
+
+    async def async_write(self, request, settings, optimistic=None):
+        """Write the settings with a single request and return the written attributes as read back from the charger."""
+        writes, expected = self.encode_settings(settings)
+        if not writes:
+            return {}
+        if optimistic is not None:
+            optimistic(expected)
+        # Values have to be JSON encoded for the v2 API
+        response = await request(
+            "/api/set", {key: json.dumps(value, separators=(',', ':')) for key, value in writes.items()}
+        )
+        for key in writes:
+            if not response or response.get(key) is not True:
+                raise ChargerConnectionError(f"Error setting '{key}', got: '{response}'")
+        # Confirm the write with a read of just the keys of the written attributes
+        keys = sorted({key for attribute in expected for key in V2_ATTRIBUTE_KEYS.get(attribute, ())})
+        status = self.decode_status(await request(self.status_path(keys)))
+        return {attribute: status.get(attribute) for attribute in expected}
+
+
+class InvalidAPILevelError(ValueError):
+    pass
+
+
+class ChargerConnectionError(Exception):
+    pass
@@ -0,0 +1,106 @@
+import logging
+import time
+from datetime import timedelta
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .protocol import json_loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# While pushed updates arrive, HTTP polling only reconciles the status at this interval
+PUSH_RECONCILE_INTERVAL = timedelta(minutes=5)
+# Without a pushed update for this long the charger is polled again at its normal interval
+PUSH_STALE_TIMEOUT = timedelta(minutes=2)
+
+
+class PushSubscription:
+    """Receive the status of an API v2 charger from its MQTT API through the MQTT integration of Home Assistant.
+
+    The charger publishes every changed key as JSON on <topic>/<key>. Keys arriving together are decoded and applied
+    to the status in one update.
+    """
+
+    def __init__(self, hass, chargerName, goeCharger, fetcher, topic):
+        self._hass = hass
+        self._chargerName = chargerName
+        self._goeCharger = goeCharger
+        self._fetcher = fetcher
+        self._topic = topic.rstrip("/")
+        self._unsubscribe = None
+        self._pending = {}
+        self._lastMessage = None
+        self._stopped = False
+        self._cancelStaleTimer = None
+
+    @property
+    def active(self):
+        """Check if updates are pushed, otherwise the charger has to be polled."""
+        return self._lastMessage is not None and time.monotonic() - self._lastMessage < PUSH_STALE_TIMEOUT.total_seconds()
+
+    async def async_start(self):
+        # The MQTT integration is optional, it is only needed for push updates
+        from homeassistant.components import mqtt
+
+        if hasattr(mqtt, "async_wait_for_mqtt_client"):
+            available = await mqtt.async_wait_for_mqtt_client(self._hass)
+        else:
+            # Older Home Assistant versions can't wait for the MQTT client, MQTT is set up before this integration (it
+            # is an after dependency) or not at all
+            available = "mqtt" in self._hass.config.components
+        if not available:
+            _LOGGER.warning(f"MQTT is not available, polling charger '{self._chargerName}' instead")
+            return
+        unsubscribe = await mqtt.async_subscribe(self._hass, f"{self._topic}/+", self._message_received)
+        if self._stopped:
+            # Unloaded while waiting for MQTT
+            unsubscribe()
+            return
+        self._unsubscribe = unsubscribe
+        _LOGGER.debug(f"subscribed to '{self._topic}/+' for charger '{self._chargerName}'")
+
+    def stop(self):
+        self._stopped = True
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._cancelStaleTimer is not None:
+            self._cancelStaleTimer()
+            self._cancelStaleTimer = None
+
+    @callback
+    def _message_received(self, message):
+        key = message.topic.rsplit("/", 1)[-1]
+        try:
+            value = json_loads(message.payload)
+        except ValueError:
+            _LOGGER.debug(f"ignoring invalid payload on '{message.topic}': {message.payload!r}")
+            return
+        wasActive = self.active
+        self._lastMessage = time.monotonic()
+        if self._cancelStaleTimer is not None:
+            self._cancelStaleTimer()
+        self._cancelStaleTimer = async_call_later(self._hass, PUSH_STALE_TIMEOUT, self._push_stale)
+        if not wasActive:
+            _LOGGER.debug(f"receiving pushed updates for charger '{self._chargerName}'")
+            self._fetcher.push_started()
+        if not self._pending:
+            # Apply everything published in the same burst at once
+            self._hass.loop.call_soon(self._flush)
+        self._pending[key] = value
+
+    @callback
+    def _flush(self):
+        values = self._pending
+        self._pending = {}
+        attributes = self._goeCharger.decode_status_update(values)
+        if attributes:
+            self._fetcher.apply_status(attributes, pushed=True)
+
+    @callback
+    def _push_stale(self, now):
+        self._cancelStaleTimer = None
+        self._lastMessage = None
+        _LOGGER.debug(f"no pushed update for charger '{self._chargerName}' since {PUSH_STALE_TIMEOUT}, polling again")
+        self._fetcher.push_stopped()
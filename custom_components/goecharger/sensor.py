@@ -1,11 +1,14 @@
 """Platform for go-eCharger sensor integration."""
 import logging
+import time
+from collections import namedtuple
 from homeassistant.const import (
     TEMP_CELSIUS,
     ENERGY_KILO_WATT_HOUR
 )
 
 from homeassistant import core, config_entries
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.sensor import (
     STATE_CLASS_TOTAL_INCREASING,
@@ -14,7 +17,11 @@ from homeassistant.components.sensor import (
 )
 
 
-from .const import CONF_CHARGERS, DOMAIN, CONF_NAME, CONF_CORRECTION_FACTOR, CONF_API_LEVEL
+from .const import (
+    CONF_CHARGERS, DOMAIN, CONF_NAME, CONF_CORRECTION_FACTOR, CONF_API_LEVEL,
+    CONF_DEADBAND_VOLTAGE, CONF_DEADBAND_POWER_FACTOR, CONF_DEADBAND_TEMPERATURE, CONF_DEADBAND_RELATIVE,
+    CONF_DEADBAND_MAX_SILENCE, DEFAULT_DEADBAND_MAX_SILENCE,
+)
 from .charger import InvalidAPILevelError
 
 AMPERE = 'A'
@@ -58,7 +65,10 @@ _sensorUnits = {
     'lf_l3': {'unit': PERCENT, 'name': 'Power factor L3'},
     'lf_n': {'unit': PERCENT, 'name': 'Loadfactor N'},
     'car_status': {'unit': '', 'name': 'Status'},
-    'phase_mode': {'unit': '', 'name': 'Phase mode'}
+    'phase_mode': {'unit': '', 'name': 'Phase mode'},
+    'charging_mode': {'unit': '', 'name': 'Charging mode'},
+    'ampere': {'unit': AMPERE, 'name': 'Current allowed'},
+    'device_model': {'unit': '', 'name': 'Device model'},
 }
 
 _sensorStateClass = {
@@ -75,6 +85,23 @@ _sensorDeviceClass = {
     'current_session_charged_energy_corrected': DEVICE_CLASS_ENERGY
 }
 
+# Noisy sensors that can be filtered with a deadband, mapped to the option holding their absolute threshold
+_sensorDeadbandOption = {
+    'u_l1': CONF_DEADBAND_VOLTAGE,
+    'u_l2': CONF_DEADBAND_VOLTAGE,
+    'u_l3': CONF_DEADBAND_VOLTAGE,
+    'u_n': CONF_DEADBAND_VOLTAGE,
+    'lf_l1': CONF_DEADBAND_POWER_FACTOR,
+    'lf_l2': CONF_DEADBAND_POWER_FACTOR,
+    'lf_l3': CONF_DEADBAND_POWER_FACTOR,
+    'lf_n': CONF_DEADBAND_POWER_FACTOR,
+    'charger_temp': CONF_DEADBAND_TEMPERATURE,
+    'charger_temp0': CONF_DEADBAND_TEMPERATURE,
+    'charger_temp1': CONF_DEADBAND_TEMPERATURE,
+    'charger_temp2': CONF_DEADBAND_TEMPERATURE,
+    'charger_temp3': CONF_DEADBAND_TEMPERATURE,
+}
+
 _sensorsv1 = [
     'car_status',
     'charger_max_current',
@@ -129,39 +156,114 @@ _sensorsv1 = [
     'timezone_dst_offset',
 ]
 
-# TODO: Add Sensor for APIv2
+# The API v2 status is decoded into the attribute names of v1 (see protocol.V2_STATUS_KEYS)
 _sensorsv2 = [
+    'car_status',
+    'charger_max_current',
+    'charger_absolute_max_current',
+    'charger_err',
+    'cable_lock_mode',
+    'cable_max_current',
+    'charger_temp',
+    'charger_temp0',
+    'charger_temp1',
+    'current_session_charged_energy',
+    'current_session_charged_energy_corrected',
+    'charge_limit',
+    'energy_total',
+    'energy_total_corrected',
     'phase_mode',
+    'charging_mode',
+    'ampere',
+
+    'u_l1',
+    'u_l2',
+    'u_l3',
+    'u_n',
+    'i_l1',
+    'i_l2',
+    'i_l3',
+    'p_l1',
+    'p_l2',
+    'p_l3',
+    'p_n',
+    'p_all',
+    'lf_l1',
+    'lf_l2',
+    'lf_l3',
+    'lf_n',
+
+    'device_model',
+    'firmware',
+    'serial_number',
 ]
 
 
-def _create_sensors_for_charger(chargerName, hass, correctionFactor, api_level):
+# Everything a sensor needs that doesn't depend on the charger, precompiled once from the tables above
+SensorDescriptor = namedtuple(
+    "SensorDescriptor", ["attribute", "name", "unit", "stateClass", "deviceClass", "sourceAttribute", "corrected"]
+)
+
+
+def _create_descriptor(sensor):
+    # The corrected values are derived from the uncorrected ones
+    corrected = sensor.endswith('_corrected')
+    return SensorDescriptor(
+        attribute=sensor,
+        name=_sensorUnits[sensor]['name'] if sensor in _sensorUnits else sensor,
+        unit=_sensorUnits[sensor]['unit'] if sensor in _sensorUnits else '',
+        stateClass=_sensorStateClass.get(sensor),
+        deviceClass=_sensorDeviceClass.get(sensor),
+        sourceAttribute=sensor[:-len('_corrected')] if corrected else sensor,
+        corrected=corrected,
+    )
+
+
+_sensorDescriptors = {
+    "1": tuple(_create_descriptor(sensor) for sensor in _sensorsv1),
+    "2": tuple(_create_descriptor(sensor) for sensor in _sensorsv2),
+}
+
+
+def _create_accessor(descriptor, correctionFactor):
+    """Return a function reading the value of a sensor from the status of its charger."""
+    sourceAttribute = descriptor.sourceAttribute
+    if descriptor.corrected:
+        def read(data):
+            value = data.get(sourceAttribute)
+            return value * correctionFactor if value is not None else None
+        return read
+    return lambda data: data.get(sourceAttribute)
+
+
+def _get_deadbands(options):
+    """Return the deadband (absolute threshold, relative threshold in %, max silence in s) per sensor."""
+    deadbands = {}
+    relative = float(options.get(CONF_DEADBAND_RELATIVE, 0) or 0)
+    maxSilence = float(options.get(CONF_DEADBAND_MAX_SILENCE, DEFAULT_DEADBAND_MAX_SILENCE))
+    for sensor, option in _sensorDeadbandOption.items():
+        absolute = float(options.get(option, 0) or 0)
+        if absolute > 0 or relative > 0:
+            deadbands[sensor] = (absolute, relative, maxSilence)
+    return deadbands
+
+
+def _create_sensors_for_charger(chargerName, hass, correctionFactor, api_level, deadbands=None):
     entities = []
+    deadbands = deadbands or {}
 
-    def add_sensor(sensor):
-        _LOGGER.debug(f"adding Sensor: {sensor} for charger {chargerName}")
+    if str(api_level) not in _sensorDescriptors:
+        raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
 
-        sensorUnit = _sensorUnits.get(sensor).get('unit') if _sensorUnits.get(sensor) else ''
-        sensorName = _sensorUnits.get(sensor).get('name') if _sensorUnits.get(sensor) else sensor
-        sensorStateClass = _sensorStateClass[sensor] if sensor in _sensorStateClass else ''
-        sensorDeviceClass = _sensorDeviceClass[sensor] if sensor in _sensorDeviceClass else ''
+    coordinator = hass.data[DOMAIN]["coordinators"][chargerName]
+    for descriptor in _sensorDescriptors[str(api_level)]:
+        _LOGGER.debug(f"adding Sensor: {descriptor.attribute} for charger {chargerName}")
         entities.append(
             GoeChargerSensor(
-                hass.data[DOMAIN]["coordinator"],
-                f"sensor.goecharger_{chargerName}_{sensor}",
-                chargerName, sensorName, sensor, sensorUnit, sensorStateClass, sensorDeviceClass, correctionFactor
+                coordinator, chargerName, descriptor, correctionFactor, deadbands.get(descriptor.attribute)
             )
         )
 
-    if api_level == "1":
-        for sensor in _sensorsv1:
-            add_sensor(sensor)
-    elif api_level == "2":
-        for sensor in _sensorsv2:
-            add_sensor(sensor)
-    else:
-        raise InvalidAPILevelError("Invalid API level. Allowed values are 1 and 2.")
-
     return entities
 
 
@@ -185,7 +287,9 @@ async def async_setup_entry(
 
     _LOGGER.debug(f"charger name: '{chargerName}'")
     _LOGGER.debug(f"config: '{config}'")
-    async_add_entities(_create_sensors_for_charger(chargerName, hass, correctionFactor, api_level))
+    async_add_entities(_create_sensors_for_charger(
+        chargerName, hass, correctionFactor, api_level, _get_deadbands(config_entry.options)
+    ))
 
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
@@ -216,19 +320,71 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
 
 
 class GoeChargerSensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, coordinator, entity_id, chargerName, name, attribute, unit, stateClass, deviceClass, correctionFactor):
+    def __init__(self, coordinator, chargerName, descriptor, correctionFactor, deadband=None):
         """Initialize the go-eCharger sensor."""
 
         super().__init__(coordinator)
         self._chargername = chargerName
-        self.entity_id = entity_id
-        self._name = name
-        self._attribute = attribute
-        self._unit = unit
-        self._attr_state_class = stateClass
-        self._attr_device_class = deviceClass
-        self.correctionFactor = correctionFactor
-
+        self.entity_id = f"sensor.goecharger_{chargerName}_{descriptor.attribute}"
+        # The descriptor is shared by the sensors of all chargers
+        self._descriptor = descriptor
+        self._read = _create_accessor(descriptor, correctionFactor)
+        self._sourceAttribute = descriptor.sourceAttribute
+        self._fetcher = None
+        self._lastAvailable = None
+        # (absolute threshold, relative threshold in %, max silence in s) or None to publish every change
+        self._deadband = deadband
+        self._publishedState = None
+        self._publishedAt = 0
+        self._changePending = False
+
+    async def async_added_to_hass(self):
+        """Register the attribute, so that it is requested from the charger."""
+        await super().async_added_to_hass()
+        self.hass.data[DOMAIN]["api"][self._chargername].add_status_consumer(self._sourceAttribute)
+        self._fetcher = self.hass.data[DOMAIN]["fetchers"][self._chargername]
+
+    async def async_will_remove_from_hass(self):
+        """Stop requesting the attribute from the charger."""
+        await super().async_will_remove_from_hass()
+        goeCharger = self.hass.data[DOMAIN]["api"].get(self._chargername)
+        if goeCharger is not None:
+            goeCharger.remove_status_consumer(self._sourceAttribute)
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Only write the state if the backing attribute changed significantly or the availability changed."""
+        available = self.available
+        if self._fetcher is None or available != self._lastAvailable:
+            self._write_state(available)
+        elif self._changePending or self._sourceAttribute in self._fetcher.changedAttributes:
+            if self._deadband is None or self._is_significant():
+                self._write_state(available)
+            else:
+                self._changePending = True
+
+    def _is_significant(self):
+        """Check if the current value left the deadband around the published one or the max silence expired."""
+        absolute, relative, maxSilence = self._deadband
+        state = self.state
+        if not isinstance(state, (int, float)) or not isinstance(self._publishedState, (int, float)):
+            return True
+        if time.monotonic() - self._publishedAt >= maxSilence:
+            return True
+        delta = abs(state - self._publishedState)
+        if absolute > 0 and delta >= absolute:
+            return True
+        if relative > 0 and delta >= abs(self._publishedState) * relative / 100:
+            return True
+        return False
+
+    def _write_state(self, available):
+        self._lastAvailable = available
+        self._changePending = False
+        if self._deadband is not None:
+            self._publishedState = self.state if available else None
+            self._publishedAt = time.monotonic()
+        self.async_write_ha_state()
 
     @property
     def device_info(self):
@@ -245,23 +401,32 @@ class GoeChargerSensor(CoordinatorEntity, SensorEntity):
     @property
     def name(self):
         """Return the name of the sensor."""
-        return self._name
+        return self._descriptor.name
+
+    @property
+    def available(self):
+        """Unavailable until a status is known, either restored from the last run or fetched."""
+        return super().available and self.coordinator.data is not None
 
     @property
     def unique_id(self):
         """Return the unique_id of the sensor."""
-        return f"{self._chargername}_{self._attribute}"
+        return f"{self._chargername}_{self._descriptor.attribute}"
 
     @property
     def state(self):
         """Return the state of the sensor."""
-        if (self._attribute == 'energy_total_corrected'):
-            return self.coordinator.data[self._chargername]['energy_total'] * self.correctionFactor
-        if (self._attribute == 'current_session_charged_energy_corrected'):
-            return self.coordinator.data[self._chargername]['current_session_charged_energy'] * self.correctionFactor   
-        return self.coordinator.data[self._chargername][self._attribute]
+        return self._read(self.coordinator.data)
 
     @property
     def unit_of_measurement(self):
         """Return the unit of measurement."""
-        return self._unit
+        return self._descriptor.unit
+
+    @property
+    def state_class(self):
+        return self._descriptor.stateClass
+
+    @property
+    def device_class(self):
+        return self._descriptor.deviceClass
@@ -0,0 +1,151 @@
+from array import array
+
+# Numbers beyond this can't be stored exactly in a double, they are kept as objects
+_MAX_EXACT_INT = 2 ** 53
+
+# IDs of the status attributes, shared by all snapshots. New attributes are appended, so an ID never changes.
+_attributeIds = {}
+_attributes = []
+
+
+def attribute_id(attribute):
+    """Return the ID of an attribute, registering it on first use."""
+    attributeId = _attributeIds.get(attribute)
+    if attributeId is None:
+        attributeId = _attributeIds[attribute] = len(_attributes)
+        _attributes.append(attribute)
+    return attributeId
+
+
+class StatusSnapshot:
+    """Immutable, versioned status of a charger.
+
+    The values are stored by attribute ID: numbers in a typed array, everything else in a tuple. Bit masks tell which
+    attributes are present, which are numbers and which of the numbers are integers. Entities can read a snapshot
+    without copying it, an update replaces the whole snapshot.
+    """
+
+    __slots__ = ("version", "_present", "_numeric", "_integers", "_numbers", "_objects")
+
+    def __init__(self, version, present, numeric, integers, numbers, objects):
+        self.version = version
+        self._present = present
+        self._numeric = numeric
+        self._integers = integers
+        self._numbers = numbers
+        self._objects = objects
+
+    @classmethod
+    def from_dict(cls, status, version=0):
+        return _EMPTY.update(status, version)
+
+    def update(self, status, version, drop=()):
+        """Return a new snapshot with the attributes of status set and the attributes in drop removed."""
+        for attribute in status:
+            attribute_id(attribute)
+        size = len(_attributes)
+        numbers = array('d', self._numbers)
+        if len(numbers) < size:
+            numbers.frombytes(bytes(8 * (size - len(numbers))))
+        objects = list(self._objects)
+        objects.extend([None] * (size - len(objects)))
+        present, numeric, integers = self._present, self._numeric, self._integers
+        for attribute in drop:
+            attributeId = _attributeIds.get(attribute)
+            if attributeId is not None:
+                mask = ~(1 << attributeId)
+                present &= mask
+                numeric &= mask
+                integers &= mask
+                objects[attributeId] = None
+        for attribute, value in status.items():
+            attributeId = _attributeIds[attribute]
+            bit = 1 << attributeId
+            present |= bit
+            numeric &= ~bit
+            integers &= ~bit
+            # bool is an int subclass, but has to stay a bool
+            valueType = type(value)
+            if valueType is float or (valueType is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT):
+                numbers[attributeId] = value
+                objects[attributeId] = None
+                numeric |= bit
+                if valueType is int:
+                    integers |= bit
+            else:
+                objects[attributeId] = value
+        return StatusSnapshot(version, present, numeric, integers, numbers, tuple(objects))
+
+    def _value(self, attributeId):
+        if self._numeric >> attributeId & 1:
+            value = self._numbers[attributeId]
+            return int(value) if self._integers >> attributeId & 1 else value
+        return self._objects[attributeId]
+
+    def _ids(self):
+        present = self._present
+        attributeId = 0
+        while present:
+            if present & 1:
+                yield attributeId
+            present >>= 1
+            attributeId += 1
+
+    def get(self, attribute, default=None):
+        attributeId = _attributeIds.get(attribute)
+        if attributeId is None or not self._present >> attributeId & 1:
+            return default
+        return self._value(attributeId)
+
+    def __getitem__(self, attribute):
+        attributeId = _attributeIds.get(attribute)
+        if attributeId is None or not self._present >> attributeId & 1:
+            raise KeyError(attribute)
+        return self._value(attributeId)
+
+    def __contains__(self, attribute):
+        attributeId = _attributeIds.get(attribute)
+        return attributeId is not None and bool(self._present >> attributeId & 1)
+
+    def __iter__(self):
+        return (_attributes[attributeId] for attributeId in self._ids())
+
+    def __len__(self):
+        return bin(self._present).count("1")
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(_attributes[attributeId], self._value(attributeId)) for attributeId in self._ids()]
+
+    def as_dict(self):
+        return dict(self.items())
+
+    def diff(self, other):
+        """Return the attributes whose value differs from the other snapshot (all attributes if other is None)."""
+        if other is None:
+            return set(self)
+        if other is self:
+            return set()
+        changed = set()
+        present = self._present | other._present
+        attributeId = 0
+        while present:
+            if present & 1:
+                bit = 1 << attributeId
+                if (
+                    (self._present ^ other._present) & bit
+                    or (self._numeric ^ other._numeric) & bit
+                    or self._value(attributeId) != other._value(attributeId)
+                ):
+                    changed.add(_attributes[attributeId])
+            present >>= 1
+            attributeId += 1
+        return changed
+
+    def __repr__(self):
+        return f"StatusSnapshot(version={self.version}, {self.as_dict()!r})"
+
+
+_EMPTY = StatusSnapshot(0, 0, 0, 0, array('d'), ())
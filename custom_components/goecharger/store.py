@@ -0,0 +1,59 @@
+import logging
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.status"
+STORAGE_VERSION = 1
+# The status is written at most this often (in seconds), it is also written when Home Assistant stops
+STORAGE_SAVE_DELAY = 300
+
+
+class StatusStore:
+    """Last known status of every charger and the serials of discovered chargers, persisted across restarts.
+
+    At startup the entities are restored from this store, so they don't have to wait for the chargers to answer.
+    """
+
+    def __init__(self, hass):
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._data = {"chargers": {}, "serials": {}}
+        self._saveScheduled = False
+
+    async def async_load(self):
+        data = await self._store.async_load()
+        if data:
+            self._data["chargers"].update(data.get("chargers", {}))
+            self._data["serials"].update(data.get("serials", {}))
+        _LOGGER.debug(f"restored status of {len(self._data['chargers'])} chargers")
+
+    def get_status(self, chargerName):
+        return self._data["chargers"].get(chargerName)
+
+    def update_status(self, chargerName, status):
+        """Remember the status (a StatusSnapshot or dict) of a charger, it is converted to a dict when written."""
+        self._data["chargers"][chargerName] = status
+        self._schedule_save()
+
+    def get_serial(self, host):
+        return self._data["serials"].get(host)
+
+    def set_serial(self, host, serial):
+        self._data["serials"][host] = serial
+        self._schedule_save()
+
+    def _schedule_save(self):
+        # Rescheduling on every update would postpone the write until Home Assistant stops
+        if not self._saveScheduled:
+            self._saveScheduled = True
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _data_to_save(self):
+        self._saveScheduled = False
+        return {
+            "chargers": {chargerName: dict(status.items()) for chargerName, status in self._data["chargers"].items()},
+            "serials": self._data["serials"],
+        }
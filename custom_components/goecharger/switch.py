@@ -1,12 +1,11 @@
 """Platform for go-eCharger switch integration."""
 import logging
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.const import CONF_HOST
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant import core, config_entries
+from homeassistant.core import callback
 
-from .const import DOMAIN, CONF_CHARGERS, CONF_NAME, CHARGER_API, CONF_API_LEVEL
-from .charger import Charger
+from .const import DOMAIN, CONF_CHARGERS, CONF_NAME, CHARGER_API
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,16 +19,15 @@ async def async_setup_entry(
     config = config_entry.as_dict()["data"]
 
     chargerName = config[CONF_NAME]
-    host = config[CONF_HOST]
-    api_level = config[CONF_API_LEVEL]
-    chargerApi = Charger(host, api_level)
+    # Use the Charger of the config entry, so that the switch shares its connection
+    chargerApi = hass.data[DOMAIN]["api"][chargerName]
 
     entities = []
 
     attribute = "allow_charging"
     entities.append(
         GoeChargerSwitch(
-            hass.data[DOMAIN]["coordinator"],
+            hass.data[DOMAIN]["coordinators"][chargerName],
             hass,
             chargerApi,
             f"switch.goecharger_{chargerName}_{attribute}",
@@ -60,7 +58,7 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         attribute = "allow_charging"
         entities.append(
             GoeChargerSwitch(
-                hass.data[DOMAIN]["coordinator"],
+                hass.data[DOMAIN]["coordinators"][chargerName],
                 hass,
                 chargerApi[chargerName],
                 f"switch.goecharger_{chargerName}_{attribute}",
@@ -83,6 +81,34 @@ class GoeChargerSwitch(CoordinatorEntity, SwitchEntity):
         self.hass = hass
         self._goeCharger = goeCharger
         self._state = None
+        self._sourceAttribute = attribute
+        self._fetcher = None
+        self._lastAvailable = None
+
+    async def async_added_to_hass(self):
+        """Register the attribute, so that it is requested from the charger."""
+        await super().async_added_to_hass()
+        self.hass.data[DOMAIN]["api"][self._chargername].add_status_consumer(self._sourceAttribute)
+        self._fetcher = self.hass.data[DOMAIN]["fetchers"][self._chargername]
+
+    async def async_will_remove_from_hass(self):
+        """Stop requesting the attribute from the charger."""
+        await super().async_will_remove_from_hass()
+        goeCharger = self.hass.data[DOMAIN]["api"].get(self._chargername)
+        if goeCharger is not None:
+            goeCharger.remove_status_consumer(self._sourceAttribute)
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Only write the state if the backing attribute or the availability changed."""
+        available = self.available
+        if (
+            self._fetcher is None
+            or available != self._lastAvailable
+            or self._sourceAttribute in self._fetcher.changedAttributes
+        ):
+            self._lastAvailable = available
+            self.async_write_ha_state()
 
     @property
     def device_info(self):
@@ -98,19 +124,26 @@ class GoeChargerSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        await self.hass.async_add_executor_job(self._goeCharger.set_allow_charging, True)
-        await self.coordinator.async_request_refresh()
+        await self.hass.data[DOMAIN]["fetchers"][self._chargername].async_command(
+            self._goeCharger.set_allow_charging, True
+        )
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
-        await self.hass.async_add_executor_job(self._goeCharger.set_allow_charging, False)
-        await self.coordinator.async_request_refresh()
+        await self.hass.data[DOMAIN]["fetchers"][self._chargername].async_command(
+            self._goeCharger.set_allow_charging, False
+        )
 
     @property
     def name(self):
         """Return the name of the switch."""
         return self._chargername
 
+    @property
+    def available(self):
+        """Unavailable until a status is known, either restored from the last run or fetched."""
+        return super().available and self.coordinator.data is not None
+
     @property
     def unique_id(self):
         """Return the unique_id of the switch."""
@@ -119,4 +152,4 @@ class GoeChargerSwitch(CoordinatorEntity, SwitchEntity):
     @property
     def is_on(self):
         """Return the state of the switch."""
-        return True if self.coordinator.data[self._chargername][self._attribute] == "on" else False
+        return True if self.coordinator.data.get(self._attribute) == "on" else False
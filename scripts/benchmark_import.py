@@ -0,0 +1,81 @@
+"""Measure the import cost of the integration and of its protocol backends.
+
+Run from the repository root in an environment with Home Assistant and the requirements installed:
+
+    python scripts/benchmark_import.py [--runs 5]
+
+Every scenario runs in a fresh interpreter with -X importtime. The script reports the cumulative import time of the
+integration package and of each backend, and which backends ended up loaded. Without a Charger of an API level its
+backend must not be loaded.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules whose cumulative import time is reported
+MODULES = ("custom_components.goecharger", "goecharger.goecharger", "requests")
+
+SCENARIOS = {
+    "integration only": "import custom_components.goecharger",
+    "API v1 in use": (
+        "import custom_components.goecharger\n"
+        "from custom_components.goecharger.protocol import load_backend\n"
+        "load_backend('1')"
+    ),
+    "API v2 in use": (
+        "import custom_components.goecharger\n"
+        "from custom_components.goecharger.protocol import load_backend\n"
+        "load_backend('2')"
+    ),
+}
+
+REPORT_LOADED = (
+    "\nimport sys\n"
+    "print(','.join(m for m in ('goecharger.goecharger', 'requests') if m in sys.modules))"
+)
+
+
+def run(code):
+    """Run code in a fresh interpreter, return the cumulative import times (in ms) and the loaded backends."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + REPORT_LOADED],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [part.strip() for part in line[len("import time:"):].split("|")]
+        if not parts[1].isdigit():
+            continue
+        name = parts[2].strip()
+        if name in MODULES:
+            times[name] = int(parts[1]) / 1000
+    return times, result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for scenario, code in SCENARIOS.items():
+        samples = {module: [] for module in MODULES}
+        loaded = ""
+        for _ in range(args.runs):
+            times, loaded = run(code)
+            for module in MODULES:
+                samples[module].append(times.get(module, 0))
+        print(f"{scenario}: loaded backends [{loaded}]")
+        for module in MODULES:
+            print(f"  {module:32} {statistics.median(samples[module]):8.1f} ms (median of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure the cost of parsing and decoding a charger status per poll.
+
+Run from the repository root:
+
+    python scripts/benchmark_status_decode.py [--number 2000]
+
+Uses the sample payloads in scripts/payloads (a full v1 /status and a full v2 /api/status response). Parsing is
+measured with the stdlib json module and, if installed, orjson. Decoding is measured for the full status and for only
+the attributes read by the default sensors. The v1 decode needs the goecharger library, it is skipped without it.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAYLOADS = os.path.join(ROOT, "scripts", "payloads")
+
+
+def load_module(name, path):
+    # Loaded from its file, importing the package would require Home Assistant
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(label, function, number):
+    seconds = min(timeit.repeat(function, number=number, repeat=5)) / number
+    print(f"  {label:40} {seconds * 1e6:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    protocol = load_module("goecharger_protocol", os.path.join(ROOT, "custom_components", "goecharger", "protocol.py"))
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    for apiLevel in ("1", "2"):
+        with open(os.path.join(PAYLOADS, f"status_v{apiLevel}.json"), "rb") as payloadFile:
+            payload = payloadFile.read()
+        text = payload.decode()
+        print(f"API v{apiLevel}: {len(payload)} bytes, {len(json.loads(text))} keys")
+
+        measure("parse (json)", lambda: json.loads(text), args.number)
+        if orjson is not None:
+            measure("parse (orjson)", lambda: orjson.loads(text), args.number)
+        print(f"  status path uses {protocol.json_loads.__module__}.loads")
+
+        try:
+            adapter = protocol.load_backend(apiLevel)()
+        except ImportError as err:
+            print(f"  decode skipped: {err}")
+            continue
+        response = protocol.json_loads(text)
+        measure("decode (all attributes)", lambda: adapter.decode_status(response), args.number)
+        if apiLevel == "2":
+            attributes = protocol.REQUIRED_ATTRIBUTES.union(("p_all", "energy_total", "allow_charging"))
+            measure(f"decode ({len(attributes)} attributes)", lambda: adapter.decode_status(response, attributes), args.number)
+        measure("parse + decode", lambda: adapter.decode_status(protocol.json_loads(text)), args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Measure the memory a charger status takes as decoded dict and as StatusSnapshot.
+
+Run from the repository root:
+
+    python scripts/benchmark_status_memory.py [--number 1000]
+
+Uses the sample payloads in scripts/payloads. Every status is decoded from the payload and kept alive, as dict or
+converted to a StatusSnapshot (the dict is dropped), and the memory allocated per status is measured with tracemalloc.
+With Home Assistant installed, the memory held by a ChargerStateFetcher after restoring and updating the status is
+measured as well, that is what a charger keeps between two polls. The attribute registry shared by all snapshots is
+filled before measuring. The v1 decode needs the goecharger library, it is skipped without it.
+"""
+
+import argparse
+import gc
+import importlib.util
+import os
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAYLOADS = os.path.join(ROOT, "scripts", "payloads")
+
+
+def load_module(name, path):
+    # Loaded from its file, importing the package would require Home Assistant
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_package(name, path):
+    """Load the integration as package, its __init__ needs Home Assistant."""
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(path, "__init__.py"), submodule_search_locations=[path]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(create, number):
+    """Return the bytes allocated per object that are still alive after creating number objects."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [create() for _ in range(number)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Without the list holding the objects
+    return (after - before - objects.__sizeof__()) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000)
+    args = parser.parse_args()
+
+    componentDir = os.path.join(ROOT, "custom_components", "goecharger")
+    try:
+        package = load_package("goecharger_integration", componentDir)
+    except ImportError as err:
+        print(f"fetcher skipped: {err}")
+        package = None
+        protocol = load_module("goecharger_protocol", os.path.join(componentDir, "protocol.py"))
+        snapshot = load_module("goecharger_snapshot", os.path.join(componentDir, "snapshot.py"))
+    else:
+        protocol = sys.modules["goecharger_integration.protocol"]
+        snapshot = sys.modules["goecharger_integration.snapshot"]
+
+    for apiLevel in ("1", "2"):
+        with open(os.path.join(PAYLOADS, f"status_v{apiLevel}.json"), "rb") as payloadFile:
+            payload = payloadFile.read()
+        try:
+            adapter = protocol.load_backend(apiLevel)()
+        except ImportError as err:
+            print(f"API v{apiLevel}: skipped: {err}")
+            continue
+
+        def decode():
+            return adapter.decode_status(protocol.json_loads(payload))
+
+        # Registers the attribute IDs, they are shared by all snapshots
+        snapshot.StatusSnapshot.from_dict(decode())
+        dictSize = measure(decode, args.number)
+        snapshotSize = measure(lambda: snapshot.StatusSnapshot.from_dict(decode()), args.number)
+        print(f"API v{apiLevel}: {len(decode())} attributes")
+        print(f"  {'dict':20} {dictSize:8.0f} bytes")
+        print(f"  {'StatusSnapshot':20} {snapshotSize:8.0f} bytes ({snapshotSize / dictSize:.0%})")
+        if package is not None:
+            fetcherSize = measure(lambda: create_fetcher(package, decode), args.number)
+            emptySize = measure(lambda: create_fetcher(package, None), args.number)
+            fetcherSize -= emptySize
+            print(f"  {'fetcher status':20} {fetcherSize:8.0f} bytes ({fetcherSize / dictSize:.0%})")
+
+
+def create_fetcher(package, decode):
+    """Create a fetcher holding a restored status updated with a second decoded status (without a status if None)."""
+    fetcher = package.ChargerStateFetcher(None, "charger", None)
+    fetcher.coordinator = SimpleNamespace(data=None, async_set_updated_data=lambda data: None)
+    if decode is not None:
+        fetcher.restore(decode())
+        status = decode()
+        status["p_all"] += 1
+        fetcher.apply_status(status)
+    return fetcher
+
+
+if __name__ == "__main__":
+    main()
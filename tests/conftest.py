@@ -0,0 +1,51 @@
+import importlib.util
+import os
+import sys
+from datetime import timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(ROOT, "custom_components", "goecharger")
+PAYLOADS = os.path.join(ROOT, "scripts", "payloads")
+PACKAGE = "goecharger_integration"
+
+
+def _register_package():
+    """Make the integration importable as goecharger_integration.
+
+    The __init__ of the integration needs Home Assistant, most modules tested here don't. Without Home Assistant the
+    package is registered without running its __init__, the tests of the Home Assistant parts are skipped then.
+    """
+    if PACKAGE in sys.modules:
+        return
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
+    if importlib.util.find_spec("homeassistant") is not None:
+        spec.loader.exec_module(module)
+
+
+class FakeCoordinator:
+    """Records how the status fetcher updates a DataUpdateCoordinator."""
+
+    def __init__(self):
+        self.data = None
+        self.update_interval = timedelta(seconds=20)
+        self.last_update_success = True
+        self.updates = []
+        self.listenerUpdates = 0
+        self.refreshRequests = 0
+
+    def async_set_updated_data(self, data):
+        self.data = data
+        self.updates.append(data)
+
+    def async_update_listeners(self):
+        self.listenerUpdates += 1
+
+    async def async_request_refresh(self):
+        self.refreshRequests += 1
+
+
+_register_package()
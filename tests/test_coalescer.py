@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from goecharger_integration.charger import CommandCoalescer  # noqa: E402
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_coalescer_writes_only_latest_value():
+    async def scenario():
+        writes = []
+
+        async def write(value):
+            writes.append(value)
+            return {"charger_max_current": value}
+
+        coalescer = CommandCoalescer(write, 0.05)
+        results = await asyncio.gather(coalescer.async_set(8), coalescer.async_set(10))
+        # Within the window after the write, 11 is superseded by 12
+        results += await asyncio.gather(coalescer.async_set(11), coalescer.async_set(12))
+        return writes, results
+
+    writes, results = run(scenario())
+    assert writes == [10, 12]
+    assert results == [None, {"charger_max_current": 10}, None, {"charger_max_current": 12}]
+
+
+def test_coalescer_skips_confirmed_value_within_window_only():
+    async def scenario():
+        writes = []
+
+        async def write(value):
+            writes.append(value)
+            return {"charger_max_current": value}
+
+        coalescer = CommandCoalescer(write, 0.05)
+        coalescer.confirm(16)
+        skipped = await coalescer.async_set(16)
+        await asyncio.sleep(0.1)
+        # The charger may have been changed since (e.g. in the app), the value is written again
+        written = await coalescer.async_set(16)
+        return skipped, written, writes
+
+    assert run(scenario()) == (None, {"charger_max_current": 16}, [16])
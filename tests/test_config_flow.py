@@ -0,0 +1,28 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from goecharger_integration.config_flow import ConfigFlowHandler, OptionsFlowHandler  # noqa: E402
+from goecharger_integration.const import (  # noqa: E402
+    CONF_COMMAND_WINDOW, CONF_DEADBAND_MAX_SILENCE, CONF_DEADBAND_VOLTAGE, CONF_HEDGE_STATUS_READS, CONF_PUSH_TOPIC,
+)
+
+
+def test_options_flow_is_created_synchronously():
+    # Home Assistant calls async_get_options_flow without awaiting it
+    entry = MagicMock()
+    assert isinstance(ConfigFlowHandler.async_get_options_flow(entry), OptionsFlowHandler)
+
+
+def test_options_form_contains_the_options():
+    entry = MagicMock()
+    entry.data = {"host": "charger", "name": "charger", "api_level": "2"}
+    entry.options = {}
+    result = asyncio.run(OptionsFlowHandler(entry).async_step_init())
+    fields = {str(key) for key in result["data_schema"].schema}
+    assert {
+        CONF_DEADBAND_VOLTAGE, CONF_DEADBAND_MAX_SILENCE, CONF_COMMAND_WINDOW, CONF_HEDGE_STATUS_READS, CONF_PUSH_TOPIC,
+    } <= fields
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from conftest import FakeCoordinator
+
+pytest.importorskip("homeassistant")
+
+import goecharger_integration  # noqa: E402
+from goecharger_integration import ChargerStateFetcher  # noqa: E402
+from goecharger_integration.charger import ChargerHealth  # noqa: E402
+from goecharger_integration.const import DOMAIN, TIER_LIVE  # noqa: E402
+
+
+class FakeCharger:
+    """Answers every status request with the full status, like API v1."""
+
+    def __init__(self, status):
+        self.status = status
+        self.health = ChargerHealth("charger")
+        self.requestedTiers = []
+
+    async def request_status(self, tiers):
+        self.requestedTiers.append(tiers)
+        return dict(self.status)
+
+
+def create_fetcher(status):
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"store": MagicMock()}}
+    goeCharger = FakeCharger(status)
+    fetcher = ChargerStateFetcher(hass, "charger", goeCharger)
+    fetcher.coordinator = FakeCoordinator()
+    return fetcher, goeCharger
+
+
+def test_values_of_tiers_not_due_are_taken_from_the_response():
+    fetcher, goeCharger = create_fetcher(
+        {"car_status": "charging", "p_all": 11.0, "charger_max_current": 16, "allow_charging": "on", "firmware": "054.7"}
+    )
+    fetcher.coordinator.data = asyncio.run(fetcher.fetch_states())
+
+    # Changed in the app, the next poll is only due for the live tier
+    goeCharger.status.update(charger_max_current=10, allow_charging="off")
+    status = asyncio.run(fetcher.fetch_states())
+    assert goeCharger.requestedTiers[-1] == frozenset((TIER_LIVE,))
+    assert status["charger_max_current"] == 10
+    assert status["allow_charging"] == "off"
+    assert status["firmware"] == "054.7"
+
+
+def test_first_refresh_of_pending_chargers(monkeypatch):
+    monkeypatch.setattr(goecharger_integration, "STARTUP_BATCH_DELAY", timedelta(0))
+    refreshed = []
+
+    class Coordinator(FakeCoordinator):
+        def __init__(self, name):
+            super().__init__()
+            self.name = name
+
+        async def async_refresh(self):
+            refreshed.append(self.name)
+
+    hass = MagicMock()
+    hass.data = {DOMAIN: {
+        "pendingRefresh": {"charger1", "charger2"},
+        "coordinators": {"charger1": Coordinator("charger1"), "charger2": Coordinator("charger2")},
+    }}
+    asyncio.run(goecharger_integration._async_refresh_pending(hass))
+    assert sorted(refreshed) == ["charger1", "charger2"]
+    assert not hass.data[DOMAIN]["pendingRefresh"]
+    assert hass.data[DOMAIN]["coordinators"]["charger1"].update_interval == timedelta(seconds=20)
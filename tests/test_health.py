@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from goecharger_integration.charger import ChargerHealth  # noqa: E402
+
+
+def test_health_opens_after_threshold_and_recovers_through_half_open():
+    health = ChargerHealth("charger", failureThreshold=3, baseDelay=0.01, maxDelay=0.05)
+    assert health.state == ChargerHealth.HEALTHY
+
+    health.record_failure()
+    assert health.state == ChargerHealth.DEGRADED
+    assert health.available and health.allow_request()
+
+    health.record_failure()
+    health.record_failure()
+    assert health.state == ChargerHealth.OPEN
+    assert not health.available
+    assert not health.allow_request()
+
+    time.sleep(0.02)
+    assert health.allow_request()
+    assert health.state == ChargerHealth.HALF_OPEN
+
+    # A failed probe re-opens the breaker
+    health.record_failure()
+    assert health.state == ChargerHealth.OPEN
+    assert health.retry_in > 0
+
+    time.sleep(0.05)
+    assert health.allow_request()
+    health.record_success()
+    assert health.state == ChargerHealth.HEALTHY
+    assert health.failures == 0
@@ -0,0 +1,56 @@
+import json
+import os
+
+import pytest
+
+from conftest import PAYLOADS
+from goecharger_integration.protocol import REQUIRED_ATTRIBUTES, V2_ATTRIBUTE_KEYS, ProtocolV2
+
+
+@pytest.fixture
+def payload():
+    with open(os.path.join(PAYLOADS, "status_v2.json")) as payloadFile:
+        return json.load(payloadFile)
+
+
+def test_decode_full_v2_status(payload):
+    status = ProtocolV2().decode_status(payload)
+    assert set(status) == set(V2_ATTRIBUTE_KEYS)
+    assert status["car_status"] == "charging"
+    assert status["charger_max_current"] == 16
+    assert status["charger_absolute_max_current"] == 32
+    assert status["charger_err"] == "OK"
+    assert status["allow_charging"] == "on"
+    assert status["charging_mode"] == "neutral"
+    assert status["phase_mode"] == "three"
+    assert status["cable_lock_mode"] == 1
+    # No limit set
+    assert status["charge_limit"] == 0
+    assert status["energy_total"] == pytest.approx(12345.678)
+    assert status["current_session_charged_energy"] == pytest.approx(3.2497)
+    assert status["charger_temp"] == 28.0
+    assert status["charger_temp0"] == 28.12
+    assert status["u_l1"] == 231.2
+    assert status["i_l3"] == 15.9
+    assert status["p_l1"] == pytest.approx(3.6805)
+    assert status["p_all"] == pytest.approx(11.0508)
+    assert status["lf_l3"] == 98
+    assert status["device_model"] == "22KW/32A"
+    assert status["firmware"] == "054.7"
+    assert status["serial_number"] == "012345"
+
+
+def test_decode_only_requested_attributes(payload):
+    protocol = ProtocolV2()
+    attributes = REQUIRED_ATTRIBUTES.union(("p_all", "energy_total"))
+    status = protocol.decode_status(payload, attributes)
+    assert set(status) == attributes
+    assert status == {attribute: value for attribute, value in protocol.decode_status(payload).items()
+                      if attribute in attributes}
+
+
+def test_decode_partial_v2_status():
+    # e.g. a filtered status or a single pushed key
+    assert ProtocolV2().decode_status({"car": 4, "unknown_key": 1}) == {
+        "car_status": "charging finished, vehicle still connected",
+    }
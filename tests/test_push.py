@@ -0,0 +1,145 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from conftest import FakeCoordinator
+
+pytest.importorskip("homeassistant")
+
+from goecharger_integration import ChargerStateFetcher  # noqa: E402
+from goecharger_integration import push  # noqa: E402
+from goecharger_integration.charger import Charger  # noqa: E402
+from goecharger_integration.const import DOMAIN  # noqa: E402
+
+TOPIC = "go-eCharger/012345"
+NRG = [231.2, 230.1, 232.4, 1.3, 16.1, 16.0, 15.9, 3680.5, 3700.1, 3670.2, 0, 11050.8, 99, 99, 98, 0]
+
+
+class FakeHass:
+    def __init__(self, loop):
+        self.loop = loop
+        self.data = {DOMAIN: {"store": MagicMock()}}
+        self.tasks = []
+
+    def async_create_task(self, target):
+        task = self.loop.create_task(target)
+        self.tasks.append(task)
+        return task
+
+
+class FakeTimers:
+    """Replaces async_call_later, the timers are fired by the test."""
+
+    def __init__(self):
+        self.timers = []
+
+    def __call__(self, hass, delay, action):
+        timer = SimpleNamespace(delay=delay, action=action, cancelled=False)
+        self.timers.append(timer)
+
+        def cancel():
+            timer.cancelled = True
+        return cancel
+
+    @property
+    def active(self):
+        return [timer for timer in self.timers if not timer.cancelled]
+
+
+@pytest.fixture
+def timers(monkeypatch):
+    fakeTimers = FakeTimers()
+    monkeypatch.setattr(push, "async_call_later", fakeTimers)
+    return fakeTimers
+
+
+def create_subscription(hass):
+    goeCharger = Charger("charger", "2")
+    # Entities reading these attributes, only they are decoded
+    goeCharger.add_status_consumer("p_all")
+    goeCharger.add_status_consumer("charger_max_current")
+    fetcher = ChargerStateFetcher(hass, "charger", goeCharger)
+    fetcher.coordinator = FakeCoordinator()
+    fetcher.restore({"car_status": "Charger ready, no vehicle", "p_all": 0.0, "charger_max_current": 16})
+    fetcher.push = push.PushSubscription(hass, "charger", goeCharger, fetcher, TOPIC + "/")
+    return fetcher
+
+
+def publish(fetcher, key, payload):
+    fetcher.push._message_received(SimpleNamespace(topic=f"{TOPIC}/{key}", payload=payload))
+
+
+def test_burst_is_applied_as_one_update_without_rescheduling_the_poll(timers):
+    async def scenario():
+        hass = FakeHass(asyncio.get_running_loop())
+        fetcher = create_subscription(hass)
+        publish(fetcher, "car", "2")
+        publish(fetcher, "nrg", str(NRG).encode())
+        publish(fetcher, "amp", "10")
+        # Not applied before the burst was flushed
+        assert fetcher.coordinator.listenerUpdates == 0
+        await asyncio.sleep(0)
+        return hass, fetcher
+
+    hass, fetcher = asyncio.run(scenario())
+    coordinator = fetcher.coordinator
+    assert coordinator.listenerUpdates == 1
+    # async_set_updated_data would reschedule the next (reconciliation) poll
+    assert coordinator.updates == []
+    assert coordinator.data["car_status"] == "charging"
+    assert coordinator.data["p_all"] == pytest.approx(11.0508)
+    assert coordinator.data["charger_max_current"] == 10
+    assert fetcher.changedAttributes == {"car_status", "p_all", "charger_max_current"}
+    hass.data[DOMAIN]["store"].update_status.assert_called_with("charger", coordinator.data)
+    # Polling slowed down to the reconciliation interval as soon as the status is pushed
+    assert fetcher.push.active
+    assert coordinator.update_interval == push.PUSH_RECONCILE_INTERVAL
+
+
+def test_invalid_payload_is_ignored(timers):
+    async def scenario():
+        fetcher = create_subscription(FakeHass(asyncio.get_running_loop()))
+        publish(fetcher, "car", "not json")
+        await asyncio.sleep(0)
+        return fetcher
+
+    fetcher = asyncio.run(scenario())
+    assert fetcher.coordinator.listenerUpdates == 0
+    assert not fetcher.push.active
+    assert timers.timers == []
+
+
+def test_polling_resumes_when_no_status_is_pushed(timers):
+    async def scenario():
+        hass = FakeHass(asyncio.get_running_loop())
+        fetcher = create_subscription(hass)
+        publish(fetcher, "car", "2")
+        publish(fetcher, "car", "4")
+        await asyncio.sleep(0)
+        # Every message re-arms the timer
+        assert len(timers.timers) == 2 and len(timers.active) == 1
+        timer = timers.active[0]
+        assert timer.delay == push.PUSH_STALE_TIMEOUT
+        timer.action(None)
+        await asyncio.gather(*hass.tasks)
+        return fetcher
+
+    fetcher = asyncio.run(scenario())
+    assert not fetcher.push.active
+    assert fetcher.coordinator.update_interval == timedelta(seconds=20)
+    assert fetcher.coordinator.refreshRequests == 1
+
+
+def test_stop_cancels_the_stale_timer(timers):
+    async def scenario():
+        fetcher = create_subscription(FakeHass(asyncio.get_running_loop()))
+        publish(fetcher, "car", "2")
+        await asyncio.sleep(0)
+        fetcher.push.stop()
+        return fetcher
+
+    asyncio.run(scenario())
+    assert timers.active == []
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from conftest import PAYLOADS
+
+pytest.importorskip("aiohttp")
+
+from goecharger_integration.charger import Charger, RequestScheduler  # noqa: E402
+from goecharger_integration.const import STATUS_TIERS, TIER_LIVE  # noqa: E402
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def load_payload(name):
+    with open(os.path.join(PAYLOADS, name)) as payloadFile:
+        return json.load(payloadFile)
+
+
+async def blocked_request(gate, result=None):
+    await gate.wait()
+    return result
+
+
+def test_scheduler_runs_commands_before_queued_polls():
+    async def scenario():
+        scheduler = RequestScheduler(1)
+        gate = asyncio.Event()
+        order = []
+
+        async def request(name):
+            order.append(name)
+
+        first = asyncio.ensure_future(scheduler.async_run(lambda: blocked_request(gate), RequestScheduler.PRIORITY_POLL))
+        await asyncio.sleep(0)
+        poll = asyncio.ensure_future(scheduler.async_run(lambda: request("poll"), RequestScheduler.PRIORITY_POLL))
+        command = asyncio.ensure_future(scheduler.async_run(lambda: request("command"), RequestScheduler.PRIORITY_COMMAND))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, poll, command)
+        return order
+
+    assert run(scenario()) == ["command", "poll"]
+
+
+def test_scheduler_superseded_poll_gets_result_of_replacement():
+    async def scenario():
+        scheduler = RequestScheduler(1)
+        gate = asyncio.Event()
+        ran = []
+
+        async def request():
+            ran.append("superseded")
+            return "own result"
+
+        first = asyncio.ensure_future(scheduler.async_run(lambda: blocked_request(gate), RequestScheduler.PRIORITY_POLL))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(scheduler.async_run(request, RequestScheduler.PRIORITY_POLL, frozenset("a")))
+        await asyncio.sleep(0)
+        replacement = asyncio.get_running_loop().create_future()
+        scheduler.supersede(lambda tag: tag <= frozenset("ab"), replacement)
+        replacement.set_result("replacement result")
+        gate.set()
+        await first
+        return await queued, ran
+
+    assert run(scenario()) == ("replacement result", [])
+
+
+def test_live_poll_superseded_by_full_poll_gets_decoded_status():
+    payload = load_payload("status_v2.json")
+
+    async def scenario():
+        charger = Charger("charger", "2")
+        charger.add_status_consumer("p_all")
+        charger.add_status_consumer("charger_absolute_max_current")
+        gate = asyncio.Event()
+        paths = []
+
+        async def http_get(path, params=None, timeout=None):
+            paths.append(path)
+            await gate.wait()
+            return payload
+
+        charger._async_http_get = http_get
+        # A command holds the only request slot, both polls are queued behind it
+        command = asyncio.ensure_future(charger._async_request("/api/set", {"amp": "16"}))
+        await asyncio.sleep(0)
+        live = asyncio.ensure_future(charger.request_status(frozenset((TIER_LIVE,))))
+        await asyncio.sleep(0)
+        full = asyncio.ensure_future(charger.request_status(frozenset(STATUS_TIERS)))
+        await asyncio.sleep(0)
+        gate.set()
+        await command
+        return await live, await full, paths
+
+    live, full, paths = run(scenario())
+    assert live == full
+    assert live["p_all"] == pytest.approx(11.0508)
+    assert live["car_status"] == "charging"
+    # The superseded live poll was never sent
+    assert len(paths) == 2
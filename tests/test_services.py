@@ -0,0 +1,32 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+import goecharger_integration  # noqa: E402
+from goecharger_integration.const import DOMAIN  # noqa: E402
+
+
+def create_hass():
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"api": {"charger1": MagicMock()}, "fetchers": {}}}
+    return hass
+
+
+def test_unknown_charger_name_is_an_invalid_service_call():
+    with pytest.raises(goecharger_integration.ServiceValidationError):
+        asyncio.run(goecharger_integration._async_send_commands(create_hass(), "charger2", "set_tmp_max_current", 16))
+
+
+def test_all_chargers_report_their_result():
+    hass = create_hass()
+
+    class Fetcher:
+        async def async_command(self, setter, *args, **kwargs):
+            return {"charger_max_current": 16}
+
+    hass.data[DOMAIN]["fetchers"]["charger1"] = Fetcher()
+    result = asyncio.run(goecharger_integration._async_send_commands(hass, "", "set_tmp_max_current", 16))
+    assert result == {"chargers": {"charger1": {"success": True}}}
@@ -0,0 +1,65 @@
+import pytest
+
+from goecharger_integration.snapshot import StatusSnapshot
+
+STATUS = {
+    "car_status": "charging",
+    "allow_charging": True,
+    "charger_max_current": 16,
+    "p_all": 11.05,
+    "energy_total": 12345.678,
+    "serial_number": "012345",
+    "charge_limit": None,
+    "charger_temp": [28.1, 27.9],
+    "big_counter": 2 ** 60,
+}
+
+
+def test_round_trip_keeps_values_and_types():
+    snapshot = StatusSnapshot.from_dict(STATUS, 3)
+    assert snapshot.version == 3
+    assert snapshot.as_dict() == STATUS
+    assert len(snapshot) == len(STATUS)
+    for attribute, value in STATUS.items():
+        assert attribute in snapshot
+        assert type(snapshot[attribute]) is type(value)
+    assert type(snapshot.get("allow_charging")) is bool
+    assert type(snapshot.get("charger_max_current")) is int
+    assert type(snapshot.get("p_all")) is float
+
+
+def test_missing_attribute():
+    snapshot = StatusSnapshot.from_dict({"p_all": 1.5})
+    assert "car_status" not in snapshot
+    assert snapshot.get("car_status", "unknown") == "unknown"
+    with pytest.raises(KeyError):
+        snapshot["car_status"]
+
+
+def test_diff():
+    snapshot = StatusSnapshot.from_dict(STATUS, 1)
+    assert snapshot.diff(None) == set(STATUS)
+    assert snapshot.diff(snapshot) == set()
+    assert snapshot.diff(StatusSnapshot.from_dict(dict(STATUS), 2)) == set()
+
+    changed = dict(STATUS, p_all=3.7, charger_max_current=True)
+    del changed["serial_number"]
+    changed["u_l1"] = 230.0
+    # True == 1, but a bool replacing an int is still a change
+    assert StatusSnapshot.from_dict(changed, 2).diff(snapshot) == {
+        "p_all", "charger_max_current", "serial_number", "u_l1",
+    }
+
+
+def test_update_creates_new_snapshot_from_previous():
+    snapshot = StatusSnapshot.from_dict(STATUS, 1)
+    changes = {"p_all": 3.7, "charger_max_current": "unknown", "u_l1": 230.0}
+    updated = snapshot.update(changes, 2, drop=("charge_limit",))
+    assert updated.version == 2
+    assert updated.as_dict() == dict(
+        {attribute: value for attribute, value in STATUS.items() if attribute != "charge_limit"},
+        **changes,
+    )
+    assert updated.diff(snapshot) == {"p_all", "charger_max_current", "u_l1", "charge_limit"}
+    # The previous snapshot is unchanged
+    assert snapshot.as_dict() == STATUS